@@ -1,4 +1,6 @@
-import pygame, math, random, array
+import pygame, math, random, sys, time
+import soundbank
+import textcache
 
 # ---------- init ----------
 pygame.mixer.pre_init(44100, -16, 2, 512)
@@ -18,18 +20,14 @@ BUTTON_BG=(50,150,255); BUTTON_HOVER=(80,180,255)
 
 # ---------- tiny synth ----------
 def tone(freq, secs, vol=0.18, shape="sine"):
-    sr=44100; n=int(sr*secs)
-    buf=array.array("h")
-    for t in range(n):
-        if shape=="sine": s=math.sin(2*math.pi*freq*t/sr)
-        elif shape=="square": s=1.0 if ((t*freq*2)//sr)%2==0 else -1.0
-        else: s=math.sin(2*math.pi*freq*t/sr)
-        v=int(s*vol*32767)
-        buf.append(v); buf.append(v)
-    return pygame.mixer.Sound(buffer=buf)
-
-sfx_shoot = tone(900, 0.07, 0.22, "square")
-sfx_hit   = tone(660, 0.12, 0.24, "sine")
+    return (freq, secs, vol, shape)
+
+sounds = soundbank.load("archery", {
+    "sfx_shoot": tone(900, 0.07, 0.22, "square"),
+    "sfx_hit":   tone(660, 0.12, 0.24, "sine"),
+})
+sfx_shoot = sounds["sfx_shoot"]
+sfx_hit   = sounds["sfx_hit"]
 
 # ---------- draw helpers ----------
 def draw_bg():
@@ -42,7 +40,7 @@ def draw_bg():
 def draw_button(rect, text, hover=False):
     color = BUTTON_HOVER if hover else BUTTON_BG
     pygame.draw.rect(screen, color, rect, border_radius=8)
-    label = font_big.render(text, True, WHITE)
+    label = textcache.render(font_big, text, WHITE)
     screen.blit(label, (rect.x + rect.width//2 - label.get_width()//2,
                         rect.y + rect.height//2 - label.get_height()//2))
 
@@ -143,25 +141,71 @@ class Arrow:
         pygame.draw.polygon(surf, (230,40,40), [tail,l,fb])
         pygame.draw.polygon(surf, (40,120,230), [tail,r,fb])
 
+class TrajectoryPreview:
+    """Dotted aim arc. The dots' offsets from the bow are closed-form in the
+    clamped angle and charge, so they are drawn once per (angle, charge) bucket
+    into a surface just big enough for them and blitted at the bow. Dots stop
+    once they leave the window, so aiming down never builds a huge surface."""
+    ANGLE_STEP = math.radians(0.25)
+    CHARGE_STEPS = 32
+    Y_STEP = 8  # bow height bucket for the bottom cut-off
+
+    def __init__(self, g=640.0, dots=26, step=0.07):
+        self.g, self.dots, self.step = g, dots, step
+        self.key = None
+        self.surface = None
+        self.offset = (0, 0)
+
+    def points(self, ang, spd, max_dx, max_dy):
+        """Offsets at t = step, 2*step, ...: (vx*t, vy*t + g*t*t/2), up to the
+        first past max_dx or max_dy."""
+        vx, vy = spd*math.cos(ang), spd*math.sin(ang)
+        pts = []
+        for k in range(1, self.dots+1):
+            t = k*self.step
+            dx, dy = vx*t, vy*t + 0.5*self.g*t*t
+            pts.append((dx, dy))
+            if dx > max_dx or dy > max_dy: break
+        return pts
+
+    def draw(self, surf, x, y, ang, charge_t):
+        key = (round(ang/self.ANGLE_STEP), round(charge_t*self.CHARGE_STEPS), int(y)//self.Y_STEP)
+        if key != self.key:
+            self.key = key
+            spd = SPEED_MIN + (SPEED_MAX-SPEED_MIN)*key[1]/self.CHARGE_STEPS
+            # cut at the bucket's top edge: never earlier than the bow's real height allows
+            max_dy = HEIGHT+30 - key[2]*self.Y_STEP
+            pts = [(math.floor(px), math.floor(py))
+                   for px, py in self.points(key[0]*self.ANGLE_STEP, spd, WIDTH-x, max_dy)]
+            left = min(px for px, _ in pts) - 3
+            top = min(py for _, py in pts) - 3
+            w = max(px for px, _ in pts) + 4 - left
+            h = max(py for _, py in pts) + 4 - top
+            self.surface = pygame.Surface((w, h), pygame.SRCALPHA)
+            for px, py in pts:
+                pygame.draw.circle(self.surface, (0,0,0,90), (px-left, py-top), 3)
+            self.offset = (left, top)
+        surf.blit(self.surface, (int(x)+self.offset[0], int(y)+self.offset[1]))
+
 # Shooter boy
 shooter_img = pygame.Surface((40,40))
 shooter_img.fill((50,150,255))
 pygame.draw.rect(shooter_img,(0,0,0),(5,5,30,30))
 
 # ---------- HUD ----------
-font_big  = pygame.font.SysFont("Arial", 34, bold=True)
-font_med  = pygame.font.SysFont("Arial", 22)
-good_font = pygame.font.SysFont("Arial", 62, bold=True)
+font_big  = textcache.font("Arial", 34, bold=True)
+font_med  = textcache.font("Arial", 22)
+good_font = textcache.font("Arial", 62, bold=True)
 
 def draw_hud(score, shots_left, charge_t, charging, good_timer):
-    screen.blit(font_big.render(f"Score: {score}", True, BLACK), (16, 12))
-    screen.blit(font_med.render(f"Shots Left: {shots_left}", True, BLACK), (18, 48))
+    screen.blit(textcache.render(font_big, f"Score: {score}", BLACK), (16, 12))
+    screen.blit(textcache.render(font_med, f"Shots Left: {shots_left}", BLACK), (18, 48))
     bw,bh=210,14; x,y=16,78
     pygame.draw.rect(screen, BLACK, (x-2,y-2,bw+4,bh+4), 2, border_radius=6)
     pygame.draw.rect(screen, BLUE,  (x,y,int(bw*charge_t),bh), border_radius=4)
     screen.blit(shooter_img, (80, HEIGHT-80))
     if good_timer>0:
-        gt = good_font.render("GOOD SHOT!", True, (0,180,0))
+        gt = textcache.render(good_font, "GOOD SHOT!", (0,180,0))
         screen.blit(gt, (WIDTH//2 - gt.get_width()//2, 40))
 
 # ---------- game state ----------
@@ -176,9 +220,57 @@ CHARGE_RATE=0.95
 SPEED_MIN=380.0
 SPEED_MAX=920.0
 good_timer=0
+preview = TrajectoryPreview()
 game_over = False
 game_started = False  # start screen
 
+# ---------- preview benchmark: python Archery.py --bench-preview ----------
+def _fullscreen_preview(ang, charge_t, bx, by):
+    # the previous per-frame preview: a window-sized alpha surface every frame
+    prev = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+    spd = SPEED_MIN + (SPEED_MAX-SPEED_MIN)*charge_t
+    vx,vy = spd*math.cos(ang), spd*math.sin(ang); g=640
+    t=0.0
+    for _ in range(26):
+        t += 0.07
+        qx = bx + vx*t
+        qy = by + vy*t + 0.5*g*t*t
+        pygame.draw.circle(prev, (0,0,0,90), (int(qx), int(qy)), 3)
+        if qx>WIDTH or qy>HEIGHT+30: break
+    screen.blit(prev,(0,0))
+
+def bench_preview(frames=600):
+    # a charge-up while the aim drifts (the frames a player actually sees), and
+    # the worst case: a charge-up aimed all the way down from the bow's start height
+    ramp = [min(1.0, k*CHARGE_RATE/FPS) for k in range(frames)]
+    cases = (("drifting aim", [(math.radians(30*math.sin(k/90)), c) for k, c in enumerate(ramp)]),
+             ("aim down 35 deg", [(math.radians(35), c) for c in ramp]))
+    for case, aims in cases:
+        biggest = 0
+        for name, draw in (("full-screen surface", lambda a, c: _fullscreen_preview(a, c, bow.x, bow.y)),
+                           ("cached preview", lambda a, c: preview.draw(screen, bow.x, bow.y, a, c))):
+            start = time.perf_counter()
+            preview.key = preview.surface = None
+            for ang, charge in aims:
+                draw_bg()
+                draw(ang, charge)
+                if preview.surface is not None:
+                    w, h = preview.surface.get_size()
+                    biggest = max(biggest, w*h*4)
+            per_frame = (time.perf_counter()-start)/frames*1000
+            print(f"{case:16s} {name:20s}: {per_frame:.3f} ms/frame (background included)")
+        print(f"{case:16s} largest cached surface: {biggest/1e6:.2f} MB "
+              f"(full screen: {WIDTH*HEIGHT*4/1e6:.2f} MB)")
+    start = time.perf_counter()
+    for _ in range(frames):
+        draw_bg()
+    print(f"{'background only':20s}: {(time.perf_counter()-start)/frames*1000:.3f} ms/frame")
+
+if "--bench-preview" in sys.argv:
+    bench_preview()
+    pygame.quit()
+    sys.exit()
+
 # Buttons
 start_button = pygame.Rect(WIDTH//2-100, HEIGHT//2-40, 200, 60)
 restart_button = pygame.Rect(WIDTH//2-100, HEIGHT//2+20, 200, 60)
@@ -257,19 +349,9 @@ while running:
     else:
         target.draw(screen)
         if charging:
-            prev = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
             ang = math.atan2(mouse_pos[1]-bow.y, mouse_pos[0]-bow.x)
             ang = max(-math.radians(35), min(math.radians(35), ang))
-            spd = SPEED_MIN + (SPEED_MAX-SPEED_MIN)*charge_t
-            vx,vy = spd*math.cos(ang), spd*math.sin(ang); g=640
-            px,py = bow.x,bow.y; t=0.0
-            for _ in range(26):
-                t += 0.07
-                qx = px + vx*t
-                qy = py + vy*t + 0.5*g*t*t
-                pygame.draw.circle(prev, (0,0,0,90), (int(qx), int(qy)), 3)
-                if qx>WIDTH or qy>HEIGHT+30: break
-            screen.blit(prev,(0,0))
+            preview.draw(screen, bow.x, bow.y, ang, charge_t)
         for a in arrows: a.draw(screen)
         aim = math.atan2(mouse_pos[1]-bow.y, mouse_pos[0]-bow.x)
         aim = max(-math.radians(35), min(math.radians(35), aim))
@@ -277,7 +359,7 @@ while running:
         draw_hud(score, shots_left, charge_t, charging, good_timer)
         if game_over:
             draw_button(restart_button, "RESTART", restart_button.collidepoint(mx,my))
-            go_txt = good_font.render("GAME OVER!", True, RED)
+            go_txt = textcache.render(good_font, "GAME OVER!", RED)
             screen.blit(go_txt, (WIDTH//2 - go_txt.get_width()//2, HEIGHT//2 - 100))
 
     pygame.display.flip()
@@ -1,7 +1,9 @@
 # =========================================================
 # Flappy Bird – Red Edition with Start & Restart Screens
 # =========================================================
-import pygame, random, math, array
+import pygame, random
+import soundbank
+import textcache
 
 pygame.mixer.pre_init(44100, -16, 2, 512)
 pygame.init()
@@ -16,22 +18,19 @@ clock = pygame.time.Clock()
 # Sound helper – tiny procedurally generated tones
 # ---------------------------------------------------------
 def make_sound(freq, duration, volume=0.3, shape='sine'):
-    sample_rate = 44100
-    frames = int(sample_rate * duration)
-    arr = array.array('h')
-    for t in range(frames):
-        val = int(volume * 32767 *
-                  (math.sin(2 * math.pi * freq * t / sample_rate) if shape == 'sine'
-                   else (1 if int(2 * freq * t / sample_rate) % 2 else -1)))
-        arr.append(val)
-        arr.append(val)  # stereo
-    return pygame.mixer.Sound(buffer=arr)
-
-sfx_flap   = make_sound(800, 0.08, 0.25)
-sfx_point  = make_sound(1000, 0.15, 0.25)
-sfx_die    = make_sound(300, 0.25, 0.4, shape='square')
-
-music_tone = make_sound(220, 4.0, 0.05)
+    return (freq, duration, volume, shape)  # synth.pcm args; channels default to 2 (stereo)
+
+sounds = soundbank.load("flappy", {
+    'sfx_flap':   make_sound(800, 0.08, 0.25),
+    'sfx_point':  make_sound(1000, 0.15, 0.25),
+    'sfx_die':    make_sound(300, 0.25, 0.4, shape='square'),
+    'music_tone': make_sound(220, 4.0, 0.05),
+})
+sfx_flap   = sounds['sfx_flap']
+sfx_point  = sounds['sfx_point']
+sfx_die    = sounds['sfx_die']
+
+music_tone = sounds['music_tone']
 music_tone.play(-1)   # loop forever
 
 # ---------------------------------------------------------
@@ -82,10 +81,10 @@ class Pipe:
 # Start screen
 # ---------------------------------------------------------
 def show_start_screen():
-    font_big  = pygame.font.SysFont(None, 48)
-    font_btn  = pygame.font.SysFont(None, 36)
-    title_txt = font_big.render("Flappy Bird", True, (255, 255, 255))
-    btn_txt   = font_btn.render("START GAME", True, (0, 0, 0))
+    font_big  = textcache.font(None, 48)
+    font_btn  = textcache.font(None, 36)
+    title_txt = textcache.render(font_big, "Flappy Bird", (255, 255, 255))
+    btn_txt   = textcache.render(font_btn, "START GAME", (0, 0, 0))
     btn_rect  = pygame.Rect(WIDTH//2 - 100, HEIGHT//2, 200, 50)
 
     while True:
@@ -106,16 +105,16 @@ def show_start_screen():
 # Game Over screen
 # ---------------------------------------------------------
 def show_game_over_screen(score):
-    font_big = pygame.font.SysFont(None, 48)
-    font_small = pygame.font.SysFont(None, 32)
-    btn_txt = font_small.render("CLICK TO RESTART", True, (0, 0, 0))
+    font_big = textcache.font(None, 48)
+    font_small = textcache.font(None, 32)
+    btn_txt = textcache.render(font_small, "CLICK TO RESTART", (0, 0, 0))
     btn_rect = pygame.Rect(WIDTH//2 - 100, HEIGHT//2 + 50, 200, 40)
 
     while True:
         screen.fill((0, 0, 0))
-        screen.blit(font_big.render("Game Over", True, (255, 255, 255)),
+        screen.blit(textcache.render(font_big, "Game Over", (255, 255, 255)),
                     (WIDTH // 2 - 80, HEIGHT // 2 - 60))
-        screen.blit(font_small.render(f"Score: {score}", True, (255, 255, 255)),
+        screen.blit(textcache.render(font_small, f"Score: {score}", (255, 255, 255)),
                     (WIDTH // 2 - 40, HEIGHT // 2 - 20))
         pygame.draw.rect(screen, (0, 200, 0), btn_rect, border_radius=10)
         screen.blit(btn_txt, (btn_rect.x + (btn_rect.w - btn_txt.get_width())//2,
@@ -135,7 +134,7 @@ def game_loop():
     bird = Bird()
     pipes = [Pipe()]
     score = 0
-    font_big = pygame.font.SysFont(None, 48)
+    font_big = textcache.font(None, 48)
 
     running = True
     while running:
@@ -178,7 +177,7 @@ def game_loop():
         for p in pipes:
             p.draw()
 
-        score_surf = font_big.render(str(score), True, (255, 255, 255))
+        score_surf = textcache.render(font_big, str(score), (255, 255, 255))
         screen.blit(score_surf, (WIDTH // 2 - score_surf.get_width() // 2, 30))
 
         pygame.display.flip()
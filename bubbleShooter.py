@@ -1,10 +1,11 @@
-import pygame, sys, math, random
+import pygame, sys, math
+from collections import deque
+import textcache
+from layers import StaticLayer
+from bubble_engine import BubbleEngine
+from bubble_ai import ShotPlanner
 
-# Initialize pygame
-pygame.init()
 WIDTH, HEIGHT = 640, 720
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Bubble Shooter")
 
 # Colors
 COLORS = [(255,0,0),(0,255,0),(0,0,255),(255,255,0),
@@ -15,14 +16,37 @@ RED = (255,50,50)
 
 # Settings
 FPS = 60
+# the grid can't change while a bubble flies, so by default its whole flight
+# (bounces and impact) is worked out once at launch; --per-frame-collision
+# checks the neighbourhood every frame instead
+PRECOMPUTE_FLIGHT = "--per-frame-collision" not in sys.argv
+# --ai: the computer aims, scoring every angle in worker processes (bubble_ai.py)
+AI_PLAYER = "--ai" in sys.argv
+# --seed S replays the same bubble colours; --save-log FILE writes the seed and
+# every angle fired on exit, and --replay FILE plays such a log back
+def _arg(name):
+    return sys.argv[sys.argv.index(name)+1] if name in sys.argv else None
+SEED = _arg("--seed")
+SAVE_LOG = _arg("--save-log")
+REPLAY = _arg("--replay")
 RADIUS = 20
 ROWS = 8
 COLS = WIDTH // (RADIUS*2)
+launcher_x = WIDTH//2
+launcher_y = HEIGHT - 60
+
+# the AI's worker processes are forked before SDL starts any threads
+planner = ShotPlanner(COLS,RADIUS,WIDTH,(launcher_x,launcher_y),ROWS-1) if AI_PLAYER else None
+
+# Initialize pygame
+pygame.init()
+screen = pygame.display.set_mode((WIDTH, HEIGHT))
+pygame.display.set_caption("Bubble Shooter")
 
 clock = pygame.time.Clock()
-font = pygame.font.SysFont(None,36)
+font = textcache.font(None,36)
 
-# Bubble class
+# Bubble class (the one in the launcher / in flight; the board is a HexGrid)
 class Bubble:
     def __init__(self,x,y,color):
         self.x=x
@@ -32,43 +56,46 @@ class Bubble:
         self.rect=pygame.Rect(self.x-self.radius,self.y-self.radius,
                               self.radius*2,self.radius*2)
     def draw(self,win):
-        pygame.draw.circle(win,self.color,(self.x,self.y),self.radius)
-        pygame.draw.circle(win,WHITE,(self.x,self.y),self.radius,2)
+        win.blit(bubble_sprite(self.color),(round(self.x)-self.radius,round(self.y)-self.radius))
+
+# one prerendered bubble (fill + outline) per colour
+sprites={}
+def bubble_sprite(color):
+    surf=sprites.get(color)
+    if surf is None:
+        surf=pygame.Surface((RADIUS*2,RADIUS*2),pygame.SRCALPHA)
+        pygame.draw.circle(surf,color,(RADIUS,RADIUS),RADIUS)
+        pygame.draw.circle(surf,WHITE,(RADIUS,RADIUS),RADIUS,2)
+        surf=sprites[color]=surf.convert_alpha()
+    return surf
 
 # Shooter boy
 shooter_img = pygame.Surface((40,40))
 shooter_img.fill((50,150,255))
 pygame.draw.rect(shooter_img,(0,0,0),(5,5,30,30)) # simple boy
 
-# Create initial grid
-def create_grid():
-    grid=[]
-    for row in range(ROWS):
-        row_bubbles=[]
-        for col in range(COLS):
-            if row<5:
-                x=col*RADIUS*2+RADIUS
-                y=row*RADIUS*2+RADIUS
-                color=random.choice(COLORS)
-                row_bubbles.append(Bubble(x,y,color))
-            else:
-                row_bubbles.append(None)
-        grid.append(row_bubbles)
-    return grid
-
-grid=create_grid()
+# Game state and rules live in the engine (bubble_engine.py); this file draws
+# it and feeds it angles. The board is a HexGrid: codes[row*COLS+col] is 0
+# when empty, else COLORS index + 1 (odd rows have COLS-1 cells)
+settings = dict(width=WIDTH, height=HEIGHT, radius=RADIUS, rows=ROWS, shots=30, colors=len(COLORS))
+if REPLAY:
+    engine, replay_angles = BubbleEngine.replay(REPLAY, **settings)
+    replay_angles = deque(replay_angles)
+else:
+    engine = BubbleEngine(int(SEED) if SEED else None, **settings)
+board = engine.board
+codes = board.codes  # grows in place when the board gets new rows
+
+# cells changed since the board layer was last painted
+changed=[]
 
 # Launcher
-launcher_x = WIDTH//2
-launcher_y = HEIGHT - 60
 launcher_angle = 90
-current_bubble = Bubble(launcher_x, launcher_y, random.choice(COLORS))
+current_bubble = Bubble(launcher_x, launcher_y, COLORS[engine.current-1])
 shooting = False
 velocity = [0,0]
-
-score = 0
-shots_left = 30  # limited shots
-game_over = False
+flight = deque()  # precomputed (x,y) per frame, impact position last
+shot_angle = 90   # angle of the bubble in flight; the aim may move meanwhile
 
 def get_angle(mouse_pos):
     mx,my=mouse_pos
@@ -78,105 +105,84 @@ def get_angle(mouse_pos):
     return max(20,min(160,angle))
 
 def shoot_bubble():
-    global velocity
-    rad=math.radians(launcher_angle)
+    global velocity,flight,shot_angle
+    shot_angle=launcher_angle
+    rad=math.radians(shot_angle)
     velocity=[math.cos(rad)*10,-math.sin(rad)*10]
+    if PRECOMPUTE_FLIGHT:
+        flight=engine.flight(shot_angle)
 
-def check_collision(bub):
-    for row in grid:
-        for cell in row:
-            if cell and math.hypot(cell.x-bub.x,cell.y-bub.y)<RADIUS*2-2:
-                return True
-    return False
-
-def snap_to_grid(bub):
-    row=round((bub.y-RADIUS)/(RADIUS*2))
-    col=round((bub.x-RADIUS)/(RADIUS*2))
-    if row>=len(grid):
-        grid.append([None]*COLS)
-    if grid[row][col] is None:
-        grid[row][col]=Bubble(col*RADIUS*2+RADIUS,row*RADIUS*2+RADIUS,bub.color)
-    return row,col
+def check_collision(x,y):
+    # only the cells around the nearest one can be closer than RADIUS*2-2
+    return board.collides(x,y,RADIUS*2-2)
+
+def cell_rect(i):
+    x,y=board.center(i)
+    return pygame.Rect(round(x)-RADIUS,round(y)-RADIUS,RADIUS*2,RADIUS*2)
+
+def paint_board(surf):
+    surf.fill(GRAY)
+    surf.blits([(bubble_sprite(COLORS[codes[i]-1]),cell_rect(i)) for i in board.occupied()],doreturn=False)
+
+board_layer=StaticLayer(paint_board)
 
 def draw_grid(win):
-    for row in grid:
-        for cell in row:
-            if cell:
-                cell.draw(win)
-
-def get_group(row,col,color,visited=None):
-    if visited is None:
-        visited=set()
-    if row<0 or row>=len(grid) or col<0 or col>=COLS: return visited
-    cell=grid[row][col]
-    if not cell or cell.color!=color or (row,col) in visited: return visited
-    visited.add((row,col))
-    get_group(row+1,col,color,visited)
-    get_group(row-1,col,color,visited)
-    get_group(row,col+1,color,visited)
-    get_group(row,col-1,color,visited)
-    return visited
-
-def remove_floating():
-    visited=set()
-    for col in range(COLS):
-        if grid[0][col]:
-            dfs(0,col,visited)
-    for r in range(len(grid)):
-        for c in range(COLS):
-            if grid[r][c] and (r,c) not in visited:
-                grid[r][c]=None
-
-def dfs(r,c,visited):
-    if r<0 or r>=len(grid) or c<0 or c>=COLS: return
-    if (r,c) in visited: return
-    if not grid[r][c]: return
-    visited.add((r,c))
-    dfs(r+1,c,visited)
-    dfs(r-1,c,visited)
-    dfs(r,c+1,visited)
-    dfs(r,c-1,visited)
+    # the board is painted once; after a shot only the changed cells are
+    # repainted, clipped to each cell, with the neighbours whose outlines overlap it
+    surf=board_layer.get((WIDTH,HEIGHT))
+    if changed:
+        for i in set(changed):
+            surf.set_clip(cell_rect(i))
+            surf.fill(GRAY)
+            surf.blits([(bubble_sprite(COLORS[codes[j]-1]),cell_rect(j))
+                        for j in (i,*board.neighbours(i)) if codes[j]],doreturn=False)
+        surf.set_clip(None)
+        changed.clear()
+    win.blit(surf,(0,0))
 
 # Main loop
 running=True
 while running:
-    screen.fill(GRAY)
     for event in pygame.event.get():
         if event.type==pygame.QUIT: running=False
-        if event.type==pygame.MOUSEMOTION:
+        if event.type==pygame.MOUSEMOTION and not (AI_PLAYER or REPLAY):
             launcher_angle=get_angle(pygame.mouse.get_pos())
-        if event.type==pygame.MOUSEBUTTONDOWN and not shooting and not game_over and shots_left>0:
+        if event.type==pygame.MOUSEBUTTONDOWN and not (AI_PLAYER or REPLAY) and not shooting and not engine.over:
+            shooting=True
+            shoot_bubble()
+    if not shooting and not engine.over:
+        angle=None
+        if REPLAY:
+            angle=replay_angles.popleft() if replay_angles else None
+        elif AI_PLAYER:
+            # the frame keeps running while the workers score the angles
+            angle=planner.poll(codes,engine.current)
+        if angle is not None:
+            launcher_angle=angle
             shooting=True
             shoot_bubble()
-            shots_left-=1
 
-    if not game_over:
-        if shooting:
+    if shooting:
+        if PRECOMPUTE_FLIGHT:
+            current_bubble.x,current_bubble.y=flight.popleft()
+            landed=not flight
+        else:
             current_bubble.x+=velocity[0]
             current_bubble.y+=velocity[1]
             if current_bubble.x<=RADIUS or current_bubble.x>=WIDTH-RADIUS:
                 velocity[0]*=-1
-            if current_bubble.y<=RADIUS or check_collision(current_bubble):
-                row,col=snap_to_grid(current_bubble)
-                group=get_group(row,col,current_bubble.color)
-                if len(group)>=3:
-                    for r,c in group:
-                        grid[r][c]=None
-                    score+=len(group)*10
-                    remove_floating()
-                current_bubble=Bubble(launcher_x,launcher_y,random.choice(COLORS))
-                shooting=False
-
-    # check game over
-    for c in range(COLS):
-        if grid[ROWS-1][c]:
-            game_over=True
-    if shots_left==0 and not shooting:
-        game_over=True
-
-    # draw
+            landed=current_bubble.y<=RADIUS or check_collision(current_bubble.x,current_bubble.y)
+        if landed:
+            # the board didn't change in flight, so the engine's replay of the
+            # shot lands exactly where the bubble on screen did
+            cell,popped,dropped=engine.shoot(shot_angle)
+            changed.extend((cell,*popped,*dropped))
+            current_bubble=Bubble(launcher_x,launcher_y,COLORS[engine.current-1])
+            shooting=False
+
+    # draw (the board layer covers the whole window)
     draw_grid(screen)
-    if not game_over:
+    if not engine.over:
         current_bubble.draw(screen)
         # draw shooter boy
         screen.blit(shooter_img,(launcher_x-20,launcher_y+20))
@@ -185,18 +191,22 @@ while running:
                           launcher_y-math.sin(math.radians(launcher_angle))*50),3)
 
     # Score display
-    score_text=font.render(f"Score: {score}",True,WHITE)
+    score_text=textcache.render(font,f"Score: {engine.score}",WHITE)
     screen.blit(score_text,(10,10))
-    shots_text=font.render(f"Shots: {shots_left}",True,WHITE)
+    shots_text=textcache.render(font,f"Shots: {engine.shots_left-shooting}",WHITE)
     screen.blit(shots_text,(WIDTH-150,10))
 
     # Game over
-    if game_over:
-        over_text=font.render("GAME OVER",True,RED)
+    if engine.over:
+        over_text=textcache.render(font,"GAME OVER",RED)
         screen.blit(over_text,(WIDTH//2-over_text.get_width()//2,HEIGHT//2))
 
     pygame.display.flip()
     clock.tick(FPS)
 
+if planner:
+    planner.close()
+if SAVE_LOG:
+    engine.save_log(SAVE_LOG)
 pygame.quit()
 sys.exit()
@@ -0,0 +1,185 @@
+# Bubble AI — picks launch angles for bubbleShooter by simulating every candidate
+# Candidate angles between the launcher's 20 and 160 degree clamp are each
+# flown, snapped, matched and ceiling-checked on a copy of the board. The board
+# travels to the workers as its bytes of colour codes (trailing empty rows
+# trimmed), so a task is a few hundred bytes; angles are split into one chunk
+# per worker of a process pool. Decisions are cached by (board, bubble colour).
+# This module never imports bubbleShooter (that script opens its window at import).
+# Workers are forked, so build the planner before pygame.init() starts SDL's
+# threads; without a safe fork (Windows, macOS) the shots are scored in-process.
+#
+# Self-play benchmark: python bubble_ai.py [--games N] [--workers W] [--angles A] [--seed S]
+
+import multiprocessing, os, random, sys, time
+from concurrent.futures import ProcessPoolExecutor
+from bubblegrid import HexGrid, HEX
+from bubble_engine import BubbleEngine, MIN_ANGLE, MAX_ANGLE, play
+from floodfill import FloodFill
+
+ANGLES = 57        # candidates between the launcher clamp, 2.5 degrees apart
+CACHE_SIZE = 4096
+
+
+def candidate_angles(n=ANGLES):
+    return [MIN_ANGLE + (MAX_ANGLE - MIN_ANGLE) * k / (n - 1) for k in range(n)]
+
+
+def encode(codes, cols):
+    """Board bytes without the empty rows at the bottom."""
+    used = len(bytes(codes).rstrip(b"\0"))
+    return bytes(codes[:-(-used // cols) * cols])
+
+
+def score_shot(board, cell, popped, dropped, danger_row):
+    """Cleared bubbles first; otherwise same-colour contacts, staying high and off the danger row."""
+    if popped:
+        return 10 * (len(popped) + len(dropped))
+    row = cell // board.cols
+    if danger_row is not None and row >= danger_row:
+        return -100
+    code = board.codes[cell]
+    return sum(board.codes[j] == code for j in board.neighbours(cell)) - 0.1 * row
+
+
+_boards = {}  # per-process (HexGrid, FloodFill), reused across tasks
+
+
+def _evaluate(task):
+    encoded, cols, radius, width, launcher, code, angles, danger_row = task
+    if (cols, radius) not in _boards:
+        _boards[cols, radius] = HexGrid(cols, radius), FloodFill(cols, HEX)
+    board, fill = _boards[cols, radius]
+    scores = []
+    for angle in angles:
+        board.codes[:] = encoded
+        cell, popped, dropped = play(board, fill, *launcher, angle, code, width)
+        scores.append(score_shot(board, cell, popped, dropped, danger_row))
+    return scores
+
+
+def _fork_context():
+    # spawn/forkserver would re-run bubbleShooter (no __main__ guard) in every
+    # worker, and macOS lists fork but its system frameworks don't survive it
+    if sys.platform != "darwin" and "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return None
+
+
+class ShotPlanner:
+    def __init__(self, cols, radius, width, launcher, danger_row=None, workers=None, angles=ANGLES):
+        self.geometry = (cols, radius, width, launcher)
+        self.danger_row = danger_row
+        self.angles = candidate_angles(angles)
+        self.cache = {}
+        self.hits = self.misses = 0
+        self.elapsed = 0.0
+        self.key, self.futures, self.started = None, [], 0.0
+        context = _fork_context() if workers != 0 else None
+        self.pool = None
+        if context is not None:
+            self.workers = workers or os.cpu_count() or 1
+            self.pool = ProcessPoolExecutor(self.workers, mp_context=context)
+            self.pool.submit(int).result()  # fork the workers now, not mid-game
+        else:
+            self.workers = 1
+
+    def _tasks(self, key):
+        encoded, code = key
+        cols, radius, width, launcher = self.geometry
+        step = -(-len(self.angles) // self.workers)
+        return [(encoded, cols, radius, width, launcher, code, self.angles[k:k + step], self.danger_row)
+                for k in range(0, len(self.angles), step)]
+
+    def _store(self, key, scores):
+        best = max(range(len(scores)), key=scores.__getitem__)  # first of any ties
+        if len(self.cache) >= CACHE_SIZE:
+            del self.cache[next(iter(self.cache))]
+        self.cache[key] = self.angles[best]
+        return self.angles[best]
+
+    def poll(self, codes, code):
+        """Best angle for this board and bubble code, or None while the workers
+        are still on it (the request keeps running between calls)."""
+        key = (encode(codes, self.geometry[0]), code)
+        if key in self.cache:
+            if self.key != key:
+                self.hits += 1
+                self.key, self.futures = key, []
+            return self.cache[key]
+        if self.key != key:
+            self.misses += 1
+            self.key, self.started = key, time.perf_counter()
+            if self.pool is None:
+                scores = [s for task in self._tasks(key) for s in _evaluate(task)]
+                self.elapsed += time.perf_counter() - self.started
+                return self._store(key, scores)
+            self.futures = [self.pool.submit(_evaluate, task) for task in self._tasks(key)]
+        if not all(f.done() for f in self.futures):
+            return None
+        scores = [s for f in self.futures for s in f.result()]
+        self.futures = []
+        self.elapsed += time.perf_counter() - self.started
+        return self._store(key, scores)
+
+    def best(self, codes, code):
+        """Blocking poll()."""
+        angle = self.poll(codes, code)
+        while angle is None:
+            for f in self.futures:
+                f.result()
+            angle = self.poll(codes, code)
+        return angle
+
+    @property
+    def ms_per_decision(self):
+        return self.elapsed / self.misses * 1e3 if self.misses else 0.0
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+
+# ---------- Headless self-play on BubbleEngine ----------
+def self_play(games, seed, choose):
+    """Total score and boards cleared over games played with choose(codes, code) -> angle."""
+    engine = BubbleEngine()
+    total = cleared = 0
+    for g in range(games):
+        engine.reset(seed + g)
+        while not engine.over and any(engine.board.codes):
+            engine.shoot(choose(engine.board.codes, engine.current))
+        total += engine.score
+        cleared += not any(engine.board.codes)
+    return total, cleared
+
+
+def _arg(name, default, cast=int):
+    if name in sys.argv:
+        return cast(sys.argv[sys.argv.index(name) + 1])
+    return default
+
+
+def main():
+    games, seed, angles = _arg("--games", 20), _arg("--seed", 0), _arg("--angles", ANGLES)
+    workers = _arg("--workers", None)
+    engine = BubbleEngine()
+
+    pick = random.Random(seed)
+    score, _ = self_play(games, seed, lambda codes, code: pick.uniform(MIN_ANGLE, MAX_ANGLE))
+    print(f"random angles: mean score {score / games:.1f}")
+    for w in (0, workers):
+        planner = ShotPlanner(engine.cols, engine.radius, engine.width, engine.launcher,
+                              engine.rows - 1, w, angles)
+        for run in ("", " (replay)"):
+            start = time.perf_counter()
+            score, cleared = self_play(games, seed, planner.best)
+            elapsed = time.perf_counter() - start
+            print(f"planner, {'in-process' if planner.pool is None else f'{planner.workers} workers'}{run}: "
+                  f"mean score {score / games:.1f}, {cleared} cleared, {elapsed:.2f} s, "
+                  f"{planner.ms_per_decision:.1f} ms per new board, {planner.hits} cache hits")
+        planner.close()
+
+
+if __name__ == "__main__":
+    main()
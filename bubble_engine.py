@@ -0,0 +1,174 @@
+# Bubble engine — headless, seedable bubble shooter rules with a shot log
+# BubbleEngine holds everything a game of bubbleShooter changes: the HexGrid
+# board, the bubble in the launcher, score and shots left. shoot(angle) plays
+# a whole shot in one call (flight, snap, match, ceiling check) without ever
+# touching pygame. Colours come from the engine's own random.Random(seed), so
+# the seed plus the angles fired (engine.log) replay a game exactly.
+#
+# CLI: python bubble_engine.py [--games N] [--seed S] [--save-slowest FILE]
+#      plays N games with random angles and reports shots/second and the
+#      slowest shot; python bubble_engine.py --replay FILE re-times a saved game.
+
+import json, math, random, sys, time
+from collections import deque
+from bubblegrid import HexGrid, HEX
+from floodfill import FloodFill
+
+MIN_ANGLE, MAX_ANGLE = 20, 160   # launcher clamp
+SPEED = 10                       # pixels per frame
+
+
+def fly(board, x, y, angle, width, path=None):
+    """Where a bubble fired from (x, y) stops: the top wall or the first bubble
+    it touches. Every frame's position is appended to path if one is given."""
+    rad = math.radians(angle)
+    vx, vy, r = math.cos(rad) * SPEED, -math.sin(rad) * SPEED, board.radius
+    while True:
+        x += vx
+        y += vy
+        if x <= r or x >= width - r:
+            vx *= -1
+        if path is not None:
+            path.append((x, y))
+        if y <= r or board.collides(x, y, r * 2 - 2):
+            return x, y
+
+
+def play(board, fill, x, y, angle, code, width, unanchored=()):
+    """Fire a bubble of code from (x, y) and apply the result to board.
+    Returns (cell, popped, dropped)."""
+    codes = board.codes
+    cell = board.snap(*fly(board, x, y, angle, width))
+    codes[cell] = code
+    group = fill.group(codes, cell)
+    if len(group) < 3:
+        return cell, [], []
+    for i in group:
+        codes[i] = 0
+    dropped = fill.detached(codes, group, (cell, *unanchored))
+    for i in dropped:
+        codes[i] = 0
+    return cell, group, dropped
+
+
+class BubbleEngine:
+    def __init__(self, seed=None, width=640, height=720, radius=20, rows=8,
+                 shots=30, colors=7, start_rows=5):
+        self.width = width
+        self.radius = radius
+        self.rows = rows            # a bubble in row rows-1 ends the game
+        self.shots = shots
+        self.colors = colors        # bubble codes are 1..colors
+        self.start_rows = start_rows
+        self.cols = width // (radius * 2)
+        self.launcher = (width // 2, height - 60)
+        self.fill = FloodFill(self.cols, HEX)
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        if seed is None:  # pick one anyway, so the log can always be replayed
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.board = HexGrid(self.cols, self.radius, self.rows)
+        for row in range(self.start_rows):
+            for col in range(self.board.width(row)):
+                self.board.codes[self.board.index(row, col)] = self._draw()
+        self.current = self._draw()   # code of the bubble in the launcher
+        # bubbles placed since the last pop; a later pop re-checks their anchoring
+        self.unanchored = []
+        self.score = 0
+        self.shots_left = self.shots
+        self.over = False
+        self.log = []
+
+    def _draw(self):
+        return self.rng.randrange(self.colors) + 1
+
+    def flight(self, angle):
+        """Per-frame positions of a shot at angle, impact last; changes nothing."""
+        path = deque()
+        fly(self.board, *self.launcher, angle, self.width, path)
+        return path
+
+    def shoot(self, angle):
+        """Fire the launcher bubble at angle (degrees, clamped like the mouse aim)
+        and play the shot out. Returns (cell, popped, dropped)."""
+        if self.over:
+            raise RuntimeError("the game is over")
+        angle = max(MIN_ANGLE, min(MAX_ANGLE, angle))
+        self.log.append(angle)
+        cell, popped, dropped = play(self.board, self.fill, *self.launcher, angle,
+                                     self.current, self.width, self.unanchored)
+        self.unanchored.append(cell)
+        if popped:
+            self.score += len(popped) * 10
+            self.unanchored.clear()
+        self.shots_left -= 1
+        self.current = self._draw()
+        self.over = self.shots_left == 0 or self.board.row_occupied(self.rows - 1)
+        return cell, popped, dropped
+
+    def save_log(self, path):
+        with open(path, "w") as f:
+            json.dump({"seed": self.seed, "angles": self.log}, f)
+
+    @classmethod
+    def replay(cls, path, **settings):
+        """A fresh engine for the saved game, and the angles to feed to shoot()."""
+        with open(path) as f:
+            saved = json.load(f)
+        return cls(saved["seed"], **settings), saved["angles"]
+
+
+# ---------- Headless benchmark ----------
+def _arg(name, default, cast=int):
+    if name in sys.argv:
+        return cast(sys.argv[sys.argv.index(name) + 1])
+    return default
+
+
+def main():
+    if "--replay" in sys.argv:
+        engine, angles = BubbleEngine.replay(_arg("--replay", None, str))
+        for k, angle in enumerate(angles):
+            start = time.perf_counter()
+            cell, popped, dropped = engine.shoot(angle)
+            print(f"shot {k:2d} at {angle:6.2f}: cell {cell:4d}, {len(popped)} popped, "
+                  f"{len(dropped)} dropped, {(time.perf_counter() - start) * 1e6:7.1f} us")
+        print(f"score {engine.score}, over {engine.over}")
+        return
+
+    games, seed = _arg("--games", 2000), _arg("--seed", 0)
+    aim = random.Random(seed)
+    engine = BubbleEngine()
+    shots, slowest, elapsed, total = 0, (0.0, None, 0), 0.0, 0
+    slow_log = []
+    for g in range(games):
+        engine.reset(seed + g)
+        while not engine.over:
+            start = time.perf_counter()
+            engine.shoot(aim.uniform(MIN_ANGLE, MAX_ANGLE))
+            t = time.perf_counter() - start
+            elapsed += t
+            shots += 1
+            if t > slowest[0]:
+                slowest = (t, seed + g, len(engine.log) - 1)
+                slow_log = list(engine.log)
+        total += engine.score
+    if not shots:
+        print(f"{games} games, no shots played")
+        return
+    print(f"{games} games, {shots} shots: {shots / elapsed:,.0f} shots/s, "
+          f"mean score {total / games:.1f}")
+    print(f"slowest shot: {slowest[0] * 1e6:.0f} us (seed {slowest[1]}, shot {slowest[2]})")
+    out = _arg("--save-slowest", None, str)
+    if out and slow_log:
+        engine.reset(slowest[1])
+        engine.log = slow_log
+        engine.save_log(out)
+        print(f"saved that game up to the slow shot to {out}; replay with --replay {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# Bubble grid — staggered hex board stored as a flat bytearray of colour codes
+# Even rows hold `cols` cells, odd rows `cols - 1` cells shifted right by one
+# radius, and rows sit radius*sqrt(3) apart so touching bubbles pack tightly.
+# Cell i = row * cols + col (the last slot of odd rows is never used), code 0
+# is empty, otherwise colour index + 1. Neighbours come from one offset table
+# per row parity, which FloodFill uses directly for matching and ceiling checks.
+#
+# Benchmark: python bubblegrid.py [--rows R] [--cols C]
+
+import math, sys, time
+
+# (drow, dcol) per row parity; "up" last so FloodFill's stack explores it first
+HEX = (
+    ((0, -1), (0, 1), (1, -1), (1, 0), (-1, -1), (-1, 0)),  # even rows
+    ((0, -1), (0, 1), (1, 0), (1, 1), (-1, 0), (-1, 1)),    # odd rows
+)
+
+
+class HexGrid:
+    def __init__(self, cols, radius, rows=0):
+        self.cols = cols
+        self.radius = radius
+        self.row_height = radius * math.sqrt(3)
+        self.codes = bytearray(rows * cols)
+
+    @property
+    def rows(self):
+        return len(self.codes) // self.cols
+
+    def width(self, row):
+        return self.cols - (row & 1)
+
+    def ensure_rows(self, rows):
+        """Grow the board so rows 0..rows-1 exist."""
+        if rows > self.rows:
+            self.codes.extend(bytes((rows - self.rows) * self.cols))
+
+    def index(self, row, col):
+        return row * self.cols + col
+
+    def center(self, i):
+        row, col = divmod(i, self.cols)
+        r = self.radius
+        return col * 2 * r + r + (r if row & 1 else 0), row * self.row_height + r
+
+    def neighbours(self, i):
+        row, col = divmod(i, self.cols)
+        for dr, dc in HEX[row & 1]:
+            nr, nc = row + dr, col + dc
+            if 0 <= nr < self.rows and 0 <= nc < self.width(nr):
+                yield nr * self.cols + nc
+
+    def occupied(self):
+        return [i for i, code in enumerate(self.codes) if code]
+
+    def row_occupied(self, row):
+        if row >= self.rows:
+            return False
+        start = row * self.cols
+        return any(self.codes[start:start + self.width(row)])
+
+    def _candidates(self, x, y):
+        """Valid cells whose centres may lie within two radii of (x, y)."""
+        r = self.radius
+        near = round((y - r) / self.row_height)
+        for row in range(max(0, near - 1), near + 2):
+            shift = r if row & 1 else 0
+            col = round((x - r - shift) / (2 * r))
+            for c in range(max(0, col - 1), min(self.width(row), col + 2)):
+                yield row, c
+
+    def collides(self, x, y, reach):
+        """Is any occupied cell's centre closer than reach to (x, y)?"""
+        codes, rows = self.codes, self.rows
+        for row, col in self._candidates(x, y):
+            if row >= rows:
+                break
+            i = row * self.cols + col
+            if codes[i]:
+                cx, cy = self.center(i)
+                if math.hypot(cx - x, cy - y) < reach:
+                    return True
+        return False
+
+    def snap(self, x, y):
+        """Nearest empty cell to (x, y), growing the board if it is below the last row."""
+        best, best_d, probe_y = None, None, y
+        while best is None:  # packed solid around (x, y): look a row further down
+            for row, col in self._candidates(x, probe_y):
+                i = row * self.cols + col
+                if i < len(self.codes) and self.codes[i]:
+                    continue
+                cx, cy = self.center(i)
+                d = (cx - x) ** 2 + (cy - y) ** 2
+                if best is None or d < best_d:
+                    best, best_d = i, d
+            probe_y += self.row_height
+        self.ensure_rows(best // self.cols + 1)
+        return best
+
+
+# ---------- Memory / CPU benchmark against Bubble objects in nested lists ----------
+def _arg(name, default, cast=int):
+    if name in sys.argv:
+        return cast(sys.argv[sys.argv.index(name) + 1])
+    return default
+
+
+def main():
+    import random, tracemalloc
+    import pygame
+    from floodfill import FloodFill
+
+    class Bubble:  # the per-cell object layout bubbleShooter used to keep
+        def __init__(self, x, y, color):
+            self.x, self.y, self.color, self.radius = x, y, color, 20
+            self.rect = pygame.Rect(x - 20, y - 20, 40, 40)
+
+    cols, rows = _arg("--cols", 16), _arg("--rows", 4096)
+    rng = random.Random(1)
+    colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0)]
+    tracemalloc.start()
+    grid = [[Bubble(c * 40 + 20, r * 40 + 20, rng.choice(colors)) for c in range(cols)] for r in range(rows)]
+    objects = tracemalloc.get_traced_memory()[0]
+    del grid
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    board = HexGrid(cols, 20, rows)
+    for i in range(len(board.codes)):
+        if i % cols < board.width(i // cols):
+            board.codes[i] = rng.randrange(1, 5)
+    flat = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    print(f"{rows} rows x {cols} cols: Bubble objects {objects / 1e6:.1f} MB, HexGrid {flat / 1e6:.3f} MB")
+
+    ff = FloodFill(cols, HEX)
+    t = time.perf_counter()
+    groups = [len(ff.group(board.codes, i)) for i in range(0, len(board.codes), 101)]
+    print(f"group(): {(time.perf_counter() - t) / len(groups) * 1e6:.1f} us, "
+          f"mean size {sum(groups) / len(groups):.1f}")
+    t = time.perf_counter()
+    ff.floating(board.codes)
+    print(f"full floating scan: {(time.perf_counter() - t) * 1e3:.1f} ms")
+    points = [(rng.uniform(0, cols * 40), rng.uniform(0, rows * board.row_height)) for _ in range(20000)]
+    t = time.perf_counter()
+    for x, y in points:
+        board.collides(x, y, 38)
+    print(f"collides(): {(time.perf_counter() - t) / len(points) * 1e6:.2f} us")
+    # landing spots always have free cells nearby: time snap() on an emptied board
+    board.codes[:] = bytes(len(board.codes))
+    t = time.perf_counter()
+    for x, y in points[:2000]:
+        board.snap(x, y)
+    print(f"snap(): {(time.perf_counter() - t) / 2000 * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,24 @@
 # Zombie Shooter — single file, no external assets
 # Controls: WASD move · Mouse aim · LMB shoot · R reload · P pause
 # Space = start / restart · Esc = quit
-
-import pygame, math, random, array, sys
+# Headless benchmark: python chess.py --headless [--seconds S] [--seed N]
+# Dirty-rect render:  python chess.py --dirty
+# Record / replay:    python chess.py --record run.zsr
+#                     python chess.py --replay run.zsr [--render] [--profile-tick N]
+
+import pygame, math, random, sys, os, time, struct
+import soundbank
+from spatial import SpatialHash
+import entities
+from entities import EntityStore, column
+from layers import StaticLayer, DirtyRects
+import textcache
 
 # ---------- Init ----------
+HEADLESS = "--headless" in sys.argv or ("--replay" in sys.argv and "--render" not in sys.argv)
+if HEADLESS:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
 pygame.mixer.pre_init(44100, -16, 2, 512)
 pygame.init()
 WIDTH, HEIGHT = 960, 600
@@ -12,7 +26,10 @@ screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Zombie Shooter — no assets")
 clock = pygame.time.Clock()
 FPS = 60
+STEP_DT = 1 / FPS    # fixed simulation timestep
+MAX_FRAME_DT = 0.25  # clamp long frames so the accumulator can't spiral
 rand = random.Random()
+DIRTY = "--dirty" in sys.argv  # redraw only areas touched by moving things
 
 # ---------- Difficulty / Tuning ----------
 ZOMBIE_SPEED_RANGE = (40, 70)   # ↓ slower base speed (was ~75–110)
@@ -31,66 +48,63 @@ YELLOW = (255, 215, 80)
 CYAN = (90, 200, 220)
 ORANGE = (255, 150, 60)
 
-# ---------- Tiny Synth: make tones on the fly (no files) ----------
+# ---------- Tiny Synth: tones built once into a sound bank (no files shipped) ----------
 def tone(freq=440.0, secs=0.12, vol=0.25, shape="sine"):
-    sr = 44100
-    n = int(sr * secs)
-    buf = array.array("h")
     # very light attack/decay to reduce clicks
-    attack = max(1, int(n * 0.01))
-    release = max(1, int(n * 0.08))
-    for t in range(n):
-        # waveform
-        ph = 2 * math.pi * freq * t / sr
-        if shape == "square":
-            s = 1.0 if math.sin(ph) >= 0 else -1.0
-        elif shape == "tri":
-            s = 2 / math.pi * math.asin(math.sin(ph))
-        elif shape == "saw":
-            s = 2.0 * ((t * freq / sr) % 1) - 1.0
-        else:
-            s = math.sin(ph)
-        # envelope
-        if t < attack:
-            env = t / attack
-        elif t > n - release:
-            env = max(0.0, (n - t) / release)
-        else:
-            env = 1.0
-        v = int(max(-1.0, min(1.0, s * env)) * vol * 32767)
-        buf.append(v); buf.append(v)
-    return pygame.mixer.Sound(buffer=buf)
-
-# SFX
-sfx_shoot = tone(1200, 0.06, 0.28, "square")
-sfx_reload = tone(420, 0.12, 0.22, "tri")
-sfx_hit_z = tone(660, 0.08, 0.26, "sine")
-sfx_headshot = tone(880, 0.09, 0.30, "square")
-sfx_player_hurt = tone(180, 0.18, 0.30, "sine")
-sfx_pick = tone(520, 0.09, 0.26, "sine")
-sfx_gameover = tone(90, 0.7, 0.28, "saw")
+    return (freq, secs, vol, shape, True)
 
 # Background pad (gentle chord loop)
 pad_notes = [(196, 0.035), (246.94, 0.030), (293.66, 0.028)]
-for f, v in pad_notes:
-    try:
-        tone(f, 4.0, v, "sine").play(loops=-1)
-    except Exception:
-        pass
+
+TONES = {
+    "sfx_shoot": tone(1200, 0.06, 0.28, "square"),
+    "sfx_reload": tone(420, 0.12, 0.22, "tri"),
+    "sfx_hit_z": tone(660, 0.08, 0.26, "sine"),
+    "sfx_headshot": tone(880, 0.09, 0.30, "square"),
+    "sfx_player_hurt": tone(180, 0.18, 0.30, "sine"),
+    "sfx_pick": tone(520, 0.09, 0.26, "sine"),
+    "sfx_gameover": tone(90, 0.7, 0.28, "saw"),
+}
+for i, (f, v) in enumerate(pad_notes):
+    TONES[f"pad_{i}"] = tone(f, 4.0, v, "sine")
+sounds = soundbank.load("chess", TONES)
+
+# SFX
+sfx_shoot = sounds["sfx_shoot"]
+sfx_reload = sounds["sfx_reload"]
+sfx_hit_z = sounds["sfx_hit_z"]
+sfx_headshot = sounds["sfx_headshot"]
+sfx_player_hurt = sounds["sfx_player_hurt"]
+sfx_pick = sounds["sfx_pick"]
+sfx_gameover = sounds["sfx_gameover"]
+
+def start_pad():
+    for i in range(len(pad_notes)):
+        try:
+            sounds[f"pad_{i}"].play(loops=-1)
+        except Exception:
+            pass
 
 # ---------- Helpers ----------
-def draw_grid():
-    screen.fill(BG1)
+def paint_background(surf):
+    w, h = surf.get_size()
+    surf.fill(BG1)
     # subtle vignette gradient
-    vg = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-    pygame.draw.rect(vg, (*BG2, 130), (0, 0, WIDTH, HEIGHT), border_radius=0)
-    screen.blit(vg, (0, 0))
+    vg = pygame.Surface((w, h), pygame.SRCALPHA)
+    pygame.draw.rect(vg, (*BG2, 130), (0, 0, w, h), border_radius=0)
+    surf.blit(vg, (0, 0))
     # grid
     step = 40
-    for x in range(0, WIDTH, step):
-        pygame.draw.line(screen, GRID, (x, 0), (x, HEIGHT))
-    for y in range(0, HEIGHT, step):
-        pygame.draw.line(screen, GRID, (0, y), (WIDTH, y))
+    for x in range(0, w, step):
+        pygame.draw.line(surf, GRID, (x, 0), (x, h))
+    for y in range(0, h, step):
+        pygame.draw.line(surf, GRID, (0, y), (w, y))
+
+# rendered once (and again if the window size changes), then blitted each frame
+background = StaticLayer(paint_background)
+
+def draw_grid():
+    background.blit(screen)
 
 def clamp(v, a, b): return a if v < a else b if v > b else v
 
@@ -102,7 +116,8 @@ def dist(a, b):
 
 # ---------- Classes ----------
 class Player:
-    def __init__(self):
+    def __init__(self, sfx=None):
+        self.sfx = sfx if sfx is not None else []  # names of sounds to play this frame
         self.x, self.y = WIDTH//2, HEIGHT//2
         self.r = 16
         self.speed = 260
@@ -119,13 +134,8 @@ class Player:
 
     def rect(self): return pygame.Rect(self.x-self.r, self.y-self.r, self.r*2, self.r*2)
 
-    def update(self, dt):
-        keys = pygame.key.get_pressed()
-        mx = my = 0
-        if keys[pygame.K_w]: my -= 1
-        if keys[pygame.K_s]: my += 1
-        if keys[pygame.K_a]: mx -= 1
-        if keys[pygame.K_d]: mx += 1
+    def update(self, dt, move):
+        mx, my = move
         if mx or my:
             l = math.hypot(mx, my)
             self.x += (mx/l) * self.speed * dt
@@ -150,7 +160,7 @@ class Player:
         if self.reloading or self.mag == self.mag_max or self.reserve <= 0: return
         self.reloading = True
         self.reload_t = self.reload_time
-        sfx_reload.play()
+        self.sfx.append("sfx_reload")
 
     def try_shoot(self, bullets, target_pos):
         if self.reloading or self.mag <= 0 or self.fire_t > 0: return
@@ -158,65 +168,64 @@ class Player:
         spread = math.radians(2.3)
         ang += rand.uniform(-spread, spread)
         speed = 720
-        bullets.append(Bullet(self.x, self.y, ang, speed))
+        Bullet(bullets, self.x, self.y, ang, speed)
         self.mag -= 1
         self.fire_t = self.fire_cd
-        sfx_shoot.play()
+        self.sfx.append("sfx_shoot")
 
-    def draw(self, surf):
-        mx, my = pygame.mouse.get_pos()
+    def draw(self, surf, aim):
+        mx, my = aim
         ang = angle_to((self.x, self.y), (mx, my))
         # body
-        pygame.draw.circle(surf, CYAN, (int(self.x), int(self.y)), self.r)
+        body = pygame.draw.circle(surf, CYAN, (int(self.x), int(self.y)), self.r)
         # head
         hx = self.x + math.cos(ang)*8
         hy = self.y + math.sin(ang)*8
-        pygame.draw.circle(surf, WHITE, (int(hx), int(hy)), 8)
+        head = pygame.draw.circle(surf, WHITE, (int(hx), int(hy)), 8)
         # gun
         gx = self.x + math.cos(ang)*self.r
         gy = self.y + math.sin(ang)*self.r
         gx2 = gx + math.cos(ang)*18
         gy2 = gy + math.sin(ang)*18
-        pygame.draw.line(surf, BLACK, (gx, gy), (gx2, gy2), 6)
+        gun = pygame.draw.line(surf, BLACK, (gx, gy), (gx2, gy2), 6)
         pygame.draw.line(surf, ORANGE, (gx, gy), (gx2, gy2), 3)
+        return body.unionall([head, gun])
+
+# Bullets, zombies and pickups live as rows of an EntityStore (see entities.py);
+# these classes are thin views over one row, moved in batches by the main loop.
+BULLET_FIELDS = {"x": "d", "y": "d", "vx": "d", "vy": "d", "life": "d", "alive": "q"}
+ZOMBIE_FIELDS = {"x": "d", "y": "d", "speed": "d", "hp": "q"}
+PICKUP_FIELDS = {"x": "d", "y": "d", "life": "d"}
 
 class Bullet:
-    def __init__(self, x, y, ang, speed):
-        self.x, self.y = x, y
-        self.vx = math.cos(ang)*speed
-        self.vy = math.sin(ang)*speed
-        self.life = 0.9
-        self.alive = True
-        self.r = 3
-
-    def update(self, dt):
-        self.x += self.vx*dt
-        self.y += self.vy*dt
-        self.life -= dt
-        if self.life <= 0 or self.x<0 or self.x>WIDTH or self.y<0 or self.y>HEIGHT:
-            self.alive = False
+    __slots__ = ("_store", "_i")
+    x, y, vx, vy = column("x"), column("y"), column("vx"), column("vy")
+    life, alive = column("life"), column("alive")
+    r = 3
+
+    def __init__(self, store, x, y, ang, speed):
+        store.add(self, x=x, y=y, vx=math.cos(ang)*speed, vy=math.sin(ang)*speed,
+                  life=0.9, alive=1)
 
     def draw(self, surf):
-        pygame.draw.circle(surf, YELLOW, (int(self.x), int(self.y)), self.r)
+        return pygame.draw.circle(surf, YELLOW, (int(self.x), int(self.y)), self.r)
 
 class Zombie:
-    def __init__(self, lvl=1):
+    __slots__ = ("_store", "_i")
+    x, y, speed, hp = column("x"), column("y"), column("speed"), column("hp")
+    r = 16
+    headshot_r = 8
+
+    def __init__(self, store, lvl=1):
         side = rand.choice(["l","r","t","b"])
         pad = 24
-        if side=="l": self.x, self.y = -pad, rand.randrange(HEIGHT)
-        elif side=="r": self.x, self.y = WIDTH+pad, rand.randrange(HEIGHT)
-        elif side=="t": self.x, self.y = rand.randrange(WIDTH), -pad
-        else: self.x, self.y = rand.randrange(WIDTH), HEIGHT+pad
-        self.r = 16
+        if side=="l": x, y = -pad, rand.randrange(HEIGHT)
+        elif side=="r": x, y = WIDTH+pad, rand.randrange(HEIGHT)
+        elif side=="t": x, y = rand.randrange(WIDTH), -pad
+        else: x, y = rand.randrange(WIDTH), HEIGHT+pad
         # ↓ slower movement and gentler scaling
-        self.speed = rand.uniform(*ZOMBIE_SPEED_RANGE) + lvl*ZOMBIE_SPEED_PER_LEVEL
-        self.hp = 2 + lvl//2
-        self.headshot_r = 8
-
-    def update(self, dt, player_pos):
-        ang = angle_to((self.x, self.y), player_pos)
-        self.x += math.cos(ang)*self.speed*dt
-        self.y += math.sin(ang)*self.speed*dt
+        speed = rand.uniform(*ZOMBIE_SPEED_RANGE) + lvl*ZOMBIE_SPEED_PER_LEVEL
+        store.add(self, x=x, y=y, speed=speed, hp=2 + lvl//2)
 
     def hit(self, bx, by):
         # Return score, headshot?
@@ -232,216 +241,406 @@ class Zombie:
 
     def draw(self, surf):
         # body
-        pygame.draw.circle(surf, (90, 180, 80), (int(self.x), int(self.y)), self.r)
+        body = pygame.draw.circle(surf, (90, 180, 80), (int(self.x), int(self.y)), self.r)
         # head highlight
         pygame.draw.circle(surf, (130, 220, 120), (int(self.x), int(self.y)), 8)
         # eyes
         pygame.draw.circle(surf, BLACK, (int(self.x-3), int(self.y-2)), 2)
         pygame.draw.circle(surf, BLACK, (int(self.x+3), int(self.y-2)), 2)
+        return body
 
 class Pickup:
-    def __init__(self, x, y, kind):
-        self.x, self.y = x, y
-        self.kind = kind  # "ammo" or "med"
-        self.life = 10.0
-        self.r = 10
+    __slots__ = ("_store", "_i", "kind")
+    x, y, life = column("x"), column("y"), column("life")
+    r = 10
 
-    def update(self, dt):
-        self.life -= dt
+    def __init__(self, store, x, y, kind):
+        self.kind = kind  # "ammo" or "med"
+        store.add(self, x=x, y=y, life=10.0)
 
     def draw(self, surf):
         if self.kind == "ammo":
-            pygame.draw.circle(surf, (255, 230, 120), (int(self.x), int(self.y)), self.r)
+            body = pygame.draw.circle(surf, (255, 230, 120), (int(self.x), int(self.y)), self.r)
             pygame.draw.rect(surf, BLACK, (self.x-6, self.y-3, 12, 6), border_radius=3)
         else:
-            pygame.draw.circle(surf, (150, 220, 255), (int(self.x), int(self.y)), self.r)
+            body = pygame.draw.circle(surf, (150, 220, 255), (int(self.x), int(self.y)), self.r)
             pygame.draw.rect(surf, WHITE, (self.x-2, self.y-6, 4, 12), border_radius=2)
+        return body
+
+# broadphase for bullets vs zombies: one cell spans a zombie's reach (r + 4) both ways
+bullet_grid = SpatialHash(2 * (Zombie.r + 4))
 
 # ---------- UI ----------
-font_big = pygame.font.SysFont("Verdana", 34, bold=True)
-font_med = pygame.font.SysFont("Verdana", 22)
-font_sm = pygame.font.SysFont("Verdana", 16)
+font_big = textcache.font("Verdana", 34, bold=True)
+font_med = textcache.font("Verdana", 22)
+font_sm = textcache.font("Verdana", 16)
 
 def draw_hud(p, score, level, paused, state):
+    """Draw the HUD; returns the screen rects it covered."""
     # Health bar
-    pygame.draw.rect(screen, BLACK, (18, 14, 222, 20), border_radius=8)
+    rects = [pygame.draw.rect(screen, BLACK, (18, 14, 222, 20), border_radius=8)]
     hw = int(218 * (p.hp / p.max_hp))
     pygame.draw.rect(screen, RED if p.hp<=30 else GREEN, (20, 16, hw, 16), border_radius=6)
-    screen.blit(font_sm.render("HP", True, WHITE), (22, 16))
+    screen.blit(textcache.render(font_sm, "HP", WHITE), (22, 16))
     # Ammo
-    ammo = font_med.render(f"Ammo: {p.mag}/{p.reserve}", True, WHITE)
-    screen.blit(ammo, (18, 44))
+    ammo = textcache.render(font_med, f"Ammo: {p.mag}/{p.reserve}", WHITE)
+    rects.append(screen.blit(ammo, (18, 44)))
     # Score/Level
-    screen.blit(font_med.render(f"Score: {score}", True, WHITE), (WIDTH-180, 16))
-    screen.blit(font_sm.render(f"Level: {level}", True, WHITE), (WIDTH-180, 46))
+    rects.append(screen.blit(textcache.render(font_med, f"Score: {score}", WHITE), (WIDTH-180, 16)))
+    rects.append(screen.blit(textcache.render(font_sm, f"Level: {level}", WHITE), (WIDTH-180, 46)))
     # Reload indicator
     if p.reloading:
-        rr = font_sm.render("Reloading...", True, YELLOW)
-        screen.blit(rr, (18, 70))
+        rr = textcache.render(font_sm, "Reloading...", YELLOW)
+        rects.append(screen.blit(rr, (18, 70)))
     if paused and state=="PLAYING":
-        txt = font_big.render("PAUSED", True, WHITE)
-        screen.blit(txt, (WIDTH//2 - txt.get_width()//2, 14))
+        txt = textcache.render(font_big, "PAUSED", WHITE)
+        rects.append(screen.blit(txt, (WIDTH//2 - txt.get_width()//2, 14)))
+    return rects
 
 def draw_center_text(lines, top=HEIGHT//2-80):
+    rects = []
     for i, (t, size, col) in enumerate(lines):
-        f = pygame.font.SysFont("Verdana", size, bold=True)
-        s = f.render(t, True, col)
-        screen.blit(s, (WIDTH//2 - s.get_width()//2, top + i * (size + 14)))
+        s = textcache.render(textcache.font("Verdana", size, bold=True), t, col)
+        rects.append(screen.blit(s, (WIDTH//2 - s.get_width()//2, top + i * (size + 14))))
+    return rects
 
 # ---------- Game State ----------
-player = Player()
-bullets = []
-zombies = []
-pickups = []
-score = 0
-level = 1
-spawn_timer = 0
-spawn_cooldown = 1.2
-state = "MENU"  # MENU, PLAYING, GAME_OVER
-paused = False
-
-def reset_game():
-    global player, bullets, zombies, pickups, score, level, spawn_timer, spawn_cooldown, state, paused
-    player = Player()
-    bullets = []
-    zombies = []
-    pickups = []
-    score = 0
-    level = 1
-    spawn_timer = 0
-    spawn_cooldown = 1.2
-    state = "PLAYING"
-    paused = False
-
-# ---------- Loop ----------
-running = True
-while running:
-    dt = clock.tick(FPS) / 1_000.0
-    mx, my = pygame.mouse.get_pos()
-
-    # Events
-    for e in pygame.event.get():
-        if e.type == pygame.QUIT:
-            running = False
-        elif e.type == pygame.KEYDOWN:
-            if e.key == pygame.K_ESCAPE:
-                running = False
-            if state == "MENU" and e.key == pygame.K_SPACE:
-                reset_game()
-            elif state == "GAME_OVER" and e.key == pygame.K_SPACE:
-                reset_game()
-            elif state == "PLAYING":
-                if e.key == pygame.K_r:
-                    player.start_reload()
-                if e.key == pygame.K_p:
-                    paused = not paused
-        elif e.type == pygame.MOUSEBUTTONDOWN and e.button == 1 and state=="PLAYING" and not paused:
-            player.try_shoot(bullets, (mx, my))
-
-    # Update
-    if state == "PLAYING" and not paused:
-        player.update(dt)
-        # bullets
-        for b in bullets[:]:
-            b.update(dt)
-            if not b.alive: bullets.remove(b)
-
-        # spawn zombies
-        spawn_timer -= dt
-        if spawn_timer <= 0:
-            zombies.append(Zombie(level))
-            # scale difficulty (slower overall; uses SPAWN_COOLDOWN_MIN)
-            spawn_cooldown = max(SPAWN_COOLDOWN_MIN, 1.2 - level*0.06)
-            spawn_timer = spawn_cooldown
-            if rand.random() < 0.04 + level*0.01:
-                zombies.append(Zombie(level))  # occasional double spawn
-
-        # update zombies + collisions
-        for z in zombies[:]:
-            z.update(dt, (player.x, player.y))
-            # zombie hits player?
-            if dist((z.x, z.y), (player.x, player.y)) < z.r + player.r - 2:
-                player.hp -= 12
-                sfx_player_hurt.play()
-                # push zombie back a little
-                a = angle_to((z.x, z.y), (player.x, player.y))
-                z.x -= math.cos(a)*22
-                z.y -= math.sin(a)*22
-                if player.hp <= 0:
-                    sfx_gameover.play()
-                    state = "GAME_OVER"
-
-        # bullets vs zombies
-        for z in zombies[:]:
-            for b in bullets[:]:
-                if dist((z.x, z.y), (b.x, b.y)) < z.r + 4:
-                    sc, hs = z.hit(b.x, b.y)
-                    if sc:
-                        score += 15 if hs else 8
-                        (sfx_headshot if hs else sfx_hit_z).play()
-                        b.alive = False
-                    if z.hp <= 0:
-                        # small chance to drop pickup
-                        if rand.random() < 0.14:
-                            kind = "ammo" if rand.random()<0.6 else "med"
-                            pickups.append(Pickup(z.x, z.y, kind))
-                        zombies.remove(z)
-                        break
-            # remove dead bullets
-            bullets[:] = [bb for bb in bullets if bb.alive]
-
-        # pickups
-        for p in pickups[:]:
-            p.update(dt)
-            if p.life <= 0:
-                pickups.remove(p); continue
-            if dist((p.x, p.y), (player.x, player.y)) < player.r + p.r:
-                if p.kind == "ammo":
-                    player.reserve += 24
-                else:
-                    player.hp = clamp(player.hp + 30, 0, player.max_hp)
-                sfx_pick.play()
-                pickups.remove(p)
-
-        # level up gradually by score
-        level = 1 + score // 120
-
-    # Draw
-    draw_grid()
-
-    if state == "MENU":
-        draw_center_text([
+class Inputs:
+    """One tick of player input: held WASD, mouse position and this tick's presses."""
+    __slots__ = ("up", "down", "left", "right", "mouse", "shoot", "reload", "pause", "start")
+
+    def __init__(self, up=False, down=False, left=False, right=False, mouse=(0, 0),
+                 shoot=False, reload=False, pause=False, start=False):
+        self.up, self.down, self.left, self.right = up, down, left, right
+        self.mouse = mouse
+        self.shoot, self.reload, self.pause, self.start = shoot, reload, pause, start
+
+    def move(self):
+        return (self.right - self.left, self.down - self.up)
+
+class GameState:
+    def __init__(self, seed=None):
+        if seed is not None:
+            rand.seed(seed)
+        self.seed = seed
+        self.mode = "MENU"  # MENU, PLAYING, GAME_OVER
+        self.tick = 0
+        self.sfx = []
+        self.reset()
+        self.mode = "MENU"
+
+    def reset(self):
+        self.player = Player(self.sfx)
+        self.bullets = EntityStore(BULLET_FIELDS)
+        self.zombies = EntityStore(ZOMBIE_FIELDS)
+        self.pickups = EntityStore(PICKUP_FIELDS)
+        self.score = 0
+        self.level = 1
+        self.spawn_timer = 0
+        self.spawn_cooldown = 1.2
+        self.mode = "PLAYING"
+        self.paused = False
+
+def step(state, inputs, dt):
+    """Advance the game by dt seconds. Uses only state, inputs and the module rand."""
+    state.tick += 1
+    if state.mode != "PLAYING":
+        if inputs.start:
+            state.reset()
+        return
+    player, bullets, zombies, pickups = state.player, state.bullets, state.zombies, state.pickups
+    if inputs.pause:
+        state.paused = not state.paused
+    if state.paused:
+        return
+    if inputs.reload:
+        player.start_reload()
+    if inputs.shoot:
+        player.try_shoot(bullets, inputs.mouse)
+
+    player.update(dt, inputs.move())
+    # bullets: move, age and cull in one batched pass
+    entities.integrate(bullets, dt)
+    entities.age(bullets, dt)
+    bullets.remove_rows(entities.expired(bullets, (0, 0, WIDTH, HEIGHT)))
+
+    # spawn zombies
+    state.spawn_timer -= dt
+    if state.spawn_timer <= 0:
+        Zombie(zombies, state.level)
+        # scale difficulty (slower overall; uses SPAWN_COOLDOWN_MIN)
+        state.spawn_cooldown = max(SPAWN_COOLDOWN_MIN, 1.2 - state.level*0.06)
+        state.spawn_timer = state.spawn_cooldown
+        if rand.random() < 0.04 + state.level*0.01:
+            Zombie(zombies, state.level)  # occasional double spawn
+
+    # update zombies + collisions
+    entities.seek(zombies, player.x, player.y, dt)
+    # zombie hits player?
+    for i in entities.within(zombies, player.x, player.y, Zombie.r + player.r - 2):
+        z = zombies[i]
+        player.hp -= 12
+        state.sfx.append("sfx_player_hurt")
+        # push zombie back a little
+        a = angle_to((z.x, z.y), (player.x, player.y))
+        z.x -= math.cos(a)*22
+        z.y -= math.sin(a)*22
+        if player.hp <= 0:
+            state.sfx.append("sfx_gameover")
+            state.mode = "GAME_OVER"
+
+    # bullets vs zombies (only bullets in nearby grid cells are tested)
+    bullet_grid.rebuild(bullets)
+    for z in zombies[:]:
+        for i in bullet_grid.query(z.x, z.y, z.r + 4):
+            b = bullets[i]
+            if b.alive and dist((z.x, z.y), (b.x, b.y)) < z.r + 4:
+                sc, hs = z.hit(b.x, b.y)
+                if sc:
+                    state.score += 15 if hs else 8
+                    state.sfx.append("sfx_headshot" if hs else "sfx_hit_z")
+                    b.alive = False
+                if z.hp <= 0:
+                    # small chance to drop pickup
+                    if rand.random() < 0.14:
+                        kind = "ammo" if rand.random()<0.6 else "med"
+                        Pickup(pickups, z.x, z.y, kind)
+                    zombies.remove(z)
+                    break
+    # remove dead bullets
+    bullets.remove_rows(entities.dead_rows(bullets))
+
+    # pickups
+    entities.age(pickups, dt)
+    pickups.remove_rows(entities.expired(pickups))
+    for p in pickups[:]:
+        if dist((p.x, p.y), (player.x, player.y)) < player.r + p.r:
+            if p.kind == "ammo":
+                player.reserve += 24
+            else:
+                player.hp = clamp(player.hp + 30, 0, player.max_hp)
+            state.sfx.append("sfx_pick")
+            pickups.remove(p)
+
+    # level up gradually by score
+    state.level = 1 + state.score // 120
+
+# ---------- Draw ----------
+def draw(state, mouse, clear=True):
+    """Draw one frame over the background; returns the rects drawn on top of it."""
+    if clear:
+        draw_grid()
+
+    if state.mode == "MENU":
+        return draw_center_text([
             ("ZOMBIE SHOOTER", 48, WHITE),
             ("WASD to move, Mouse to aim, Left Click to shoot", 22, WHITE),
             ("R to reload • P to pause", 22, WHITE),
             ("Press SPACE to Start", 28, YELLOW)
         ])
-    elif state == "PLAYING":
+    elif state.mode == "PLAYING":
+        player = state.player
         # draw pickups
-        for p in pickups:
-            p.draw(screen)
+        rects = [p.draw(screen) for p in state.pickups]
         # draw zombies
-        for z in zombies:
-            z.draw(screen)
+        rects += [z.draw(screen) for z in state.zombies]
         # draw bullets
-        for b in bullets:
-            b.draw(screen)
+        rects += [b.draw(screen) for b in state.bullets]
         # draw player + aim line
-        player.draw(screen)
-        a = angle_to((player.x, player.y), (mx, my))
+        rects.append(player.draw(screen, mouse))
+        a = angle_to((player.x, player.y), mouse)
         lx1 = (player.x + math.cos(a)*player.r, player.y + math.sin(a)*player.r)
         lx2 = (player.x + math.cos(a)*420,      player.y + math.sin(a)*420)
-        pygame.draw.line(screen, (255,255,255,50), lx1, lx2, 1)
+        rects.append(pygame.draw.line(screen, (255,255,255,50), lx1, lx2, 1))
 
-        draw_hud(player, score, level, paused, state)
+        return rects + draw_hud(player, state.score, state.level, state.paused, state.mode)
     else:  # GAME_OVER
-        draw_center_text([
+        return draw_center_text([
             ("GAME OVER", 64, RED),
-            (f"Score: {score}", 30, WHITE),
+            (f"Score: {state.score}", 30, WHITE),
             ("Press SPACE to Restart", 26, YELLOW)
         ])
 
-    pygame.display.flip()
+# ---------- Record / Replay ----------
+# Log layout: header (magic, version, seed, step dt), then 5 bytes per tick:
+# u8 flags (W S A D, LMB, R, P, SPACE) and the int16 mouse x, y.
+REPLAY_MAGIC = b"ZSRP"
+REPLAY_VERSION = 1
+_REPLAY_HEADER = struct.Struct("<4sHqd")
+_REPLAY_TICK = struct.Struct("<Bhh")
+
+def pack_inputs(inp):
+    flags = (inp.up | inp.down << 1 | inp.left << 2 | inp.right << 3
+             | inp.shoot << 4 | inp.reload << 5 | inp.pause << 6 | inp.start << 7)
+    x, y = (clamp(int(v), -32768, 32767) for v in inp.mouse)
+    return _REPLAY_TICK.pack(flags, x, y)
+
+def unpack_inputs(flags, x, y):
+    bit = lambda n: bool(flags >> n & 1)
+    return Inputs(bit(0), bit(1), bit(2), bit(3), (x, y), bit(4), bit(5), bit(6), bit(7))
+
+class Recorder:
+    def __init__(self, path, seed):
+        self.f = open(path, "wb")
+        self.f.write(_REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, seed, STEP_DT))
+
+    def write(self, inputs):
+        self.f.write(pack_inputs(inputs))
+
+    def close(self):
+        self.f.close()
+
+def load_replay(path):
+    """Return (seed, step dt, [Inputs per tick]) from a recorded log."""
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, seed, dt = _REPLAY_HEADER.unpack_from(data, 0)
+    if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+        raise ValueError(f"{path}: not a zombie shooter replay (v{REPLAY_VERSION})")
+    body = memoryview(data)[_REPLAY_HEADER.size:]
+    body = body[:len(body) - len(body) % _REPLAY_TICK.size]
+    return seed, dt, [unpack_inputs(*t) for t in _REPLAY_TICK.iter_unpack(body)]
+
+def replay(path, render=False, profile_tick=None):
+    """Re-run a log through step(); report score, game-over ticks and slowest ticks."""
+    seed, dt, ticks = load_replay(path)
+    state = GameState(seed)
+    game_overs, cost = [], []
+    for n, inputs in enumerate(ticks):
+        was_playing = state.mode == "PLAYING"
+        t = time.perf_counter()
+        if n + 1 == profile_tick:  # ticks are numbered from 1, like state.tick
+            import cProfile, pstats
+            prof = cProfile.Profile()
+            prof.runcall(step, state, inputs, dt)
+            pstats.Stats(prof).sort_stats("cumulative").print_stats(15)
+        else:
+            step(state, inputs, dt)
+        cost.append(time.perf_counter() - t)
+        if was_playing and state.mode == "GAME_OVER":
+            game_overs.append(state.tick)
+        if render:
+            for name in state.sfx:
+                sounds[name].play()
+            if any(e.type == pygame.QUIT or (e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE)
+                   for e in pygame.event.get()):
+                break
+            draw(state, inputs.mouse)
+            pygame.display.flip()
+            clock.tick(round(1 / dt))
+        state.sfx.clear()
+    print(f"replayed {len(ticks)} ticks (seed {seed}) in {sum(cost):.3f}s of step time")
+    print(f"score: {state.score} | level: {state.level} | game over at ticks: {game_overs or '-'}")
+    worst = sorted(range(len(cost)), key=cost.__getitem__, reverse=True)[:5]
+    print("slowest ticks: " + ", ".join(f"#{i + 1} {cost[i] * 1e6:.0f}us" for i in worst))
+    return state, game_overs
 
-pygame.quit()
-sys.exit()
+# ---------- Loop ----------
+def main(seed=None, record=None):
+    if seed is None:
+        seed = random.randrange(2**32)
+    state = GameState(seed)
+    recorder = Recorder(record, seed) if record else None
+    start_pad()
+    dirty = DirtyRects()
+    full_redraw = True
+    pending = Inputs()  # presses not yet consumed by a simulation tick
+    acc = 0.0
+    running = True
+    while running:
+        acc += min(MAX_FRAME_DT, clock.tick(FPS) / 1_000.0)
+        mouse = pygame.mouse.get_pos()
+
+        # Events
+        for e in pygame.event.get():
+            if e.type == pygame.QUIT:
+                running = False
+            elif e.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                full_redraw = True
+            elif e.type == pygame.KEYDOWN:
+                if e.key == pygame.K_ESCAPE:
+                    running = False
+                if e.key == pygame.K_SPACE:
+                    pending.start = True
+                elif e.key == pygame.K_r:
+                    pending.reload = True
+                elif e.key == pygame.K_p:
+                    pending.pause = True
+            elif e.type == pygame.MOUSEBUTTONDOWN and e.button == 1:
+                pending.shoot = True
+
+        # Update: fixed timestep; this frame's presses go to its first tick
+        keys = pygame.key.get_pressed()
+        while acc >= STEP_DT:
+            inputs = Inputs(keys[pygame.K_w], keys[pygame.K_s], keys[pygame.K_a], keys[pygame.K_d],
+                            mouse, pending.shoot, pending.reload, pending.pause, pending.start)
+            pending = Inputs()
+            if recorder:
+                recorder.write(inputs)
+            step(state, inputs, STEP_DT)
+            acc -= STEP_DT
+        for name in state.sfx:
+            sounds[name].play()
+        state.sfx.clear()
+
+        if DIRTY and not full_redraw:
+            # restore last frame's areas from the cached background, redraw, push rects
+            dirty.restore(screen, background.get(screen.get_size()))
+            dirty.flush(draw(state, mouse, clear=False))
+        else:
+            rects = draw(state, mouse)
+            pygame.display.flip()
+            dirty.reset(rects)
+            full_redraw = False
+
+    if recorder:
+        recorder.close()
+    pygame.quit()
+    sys.exit()
+
+# ---------- Headless ----------
+def bot_inputs(state, brng):
+    """Simple autopilot: aim at the nearest zombie, fire, strafe, restart on death."""
+    if state.mode != "PLAYING":
+        return Inputs(start=True)
+    p = state.player
+    target, best = (p.x + 1, p.y), None
+    for z in state.zombies:
+        d = (z.x - p.x) ** 2 + (z.y - p.y) ** 2
+        if best is None or d < best:
+            target, best = (z.x, z.y), d
+    if brng.random() < 0.02:
+        state.bot_move = (brng.randint(-1, 1), brng.randint(-1, 1))
+    mx, my = getattr(state, "bot_move", (0, 0))
+    return Inputs(my < 0, my > 0, mx < 0, mx > 0, (int(target[0]), int(target[1])), shoot=True)
+
+def run_headless(seconds=3600.0, seed=1):
+    """Simulate `seconds` of gameplay as fast as possible and report throughput."""
+    state = GameState(seed)
+    brng = random.Random(seed)
+    ticks = int(seconds / STEP_DT)
+    games, best = 0, 0
+    t0 = time.perf_counter()
+    for _ in range(ticks):
+        was_playing = state.mode == "PLAYING"
+        step(state, bot_inputs(state, brng), STEP_DT)
+        state.sfx.clear()
+        if was_playing and state.mode == "GAME_OVER":
+            games += 1
+            best = max(best, state.score)
+    wall = time.perf_counter() - t0
+    print(f"simulated {seconds:.0f}s ({ticks} ticks) in {wall:.2f}s wall")
+    print(f"{ticks / wall:,.0f} ticks/s = {seconds / wall:,.0f}x real time"
+          f" | games over: {games} | best score: {best}")
+    return ticks / wall
+
+def _arg(name, default, cast):
+    return cast(sys.argv[sys.argv.index(name) + 1]) if name in sys.argv else default
+
+if __name__ == "__main__":
+    if "--replay" in sys.argv:
+        replay(_arg("--replay", None, str), "--render" in sys.argv, _arg("--profile-tick", None, int))
+    elif HEADLESS:
+        run_headless(_arg("--seconds", 600.0, float), _arg("--seed", 1, int))
+    else:
+        main(_arg("--seed", None, int), _arg("--record", None, str))
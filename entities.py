@@ -0,0 +1,190 @@
+# Entity store — structure-of-arrays storage for many small game objects
+# Each entity type keeps its fields in contiguous columns (NumPy arrays when
+# NumPy is installed, array.array otherwise). Game classes become thin views
+# that read and write one row, so existing drawing code keeps working, while
+# per-frame movement/aging/culling runs as one batched step per type.
+
+import math, array
+
+try:
+    import numpy as np
+except ImportError:  # pure-array fallback
+    np = None
+
+_NP_TYPES = {"d": "float64", "q": "int64"}
+
+
+def _alloc(typecode, n):
+    if np is not None:
+        return np.zeros(n, dtype=_NP_TYPES[typecode])
+    return array.array(typecode, bytes(8 * n))
+
+
+def column(name):
+    """Property that maps a view attribute onto its row in the store."""
+    def get(self):
+        return self._store.cols[name][self._i]
+
+    def set(self, v):
+        self._store.cols[name][self._i] = v
+    return property(get, set)
+
+
+class EntityStore:
+    """Rows of one entity type; fields maps column name -> 'd' (float) or 'q' (int)."""
+
+    def __init__(self, fields, capacity=64):
+        self.fields = dict(fields)
+        self.n = 0
+        self.cap = capacity
+        self.cols = {name: _alloc(tc, capacity) for name, tc in self.fields.items()}
+        self.views = []
+
+    def __len__(self):
+        return self.n
+
+    def __iter__(self):
+        return iter(self.views)
+
+    def __getitem__(self, i):
+        # slicing gives a list snapshot, so `for z in store[:]` may remove safely
+        return self.views[i]
+
+    def _grow(self):
+        self.cap *= 2
+        for name, col in self.cols.items():
+            new = _alloc(self.fields[name], self.cap)
+            new[:self.n] = col[:self.n]
+            self.cols[name] = new
+
+    def add(self, view, **values):
+        if self.n == self.cap:
+            self._grow()
+        i = self.n
+        for name, col in self.cols.items():
+            col[i] = values.get(name, 0)
+        view._store, view._i = self, i
+        self.views.append(view)
+        self.n += 1
+        return view
+
+    def _swap_pop(self, i):
+        last = self.n - 1
+        if i != last:
+            for col in self.cols.values():
+                col[i] = col[last]
+            moved = self.views[last]
+            moved._i = i
+            self.views[i] = moved
+        self.views.pop()
+        self.n = last
+
+    def remove(self, view):
+        """O(1) removal: the last row is moved into the hole (order is not kept)."""
+        if view._store is not self:
+            raise ValueError("entity is not in this store")
+        self._swap_pop(view._i)
+        view._store = None
+
+    def remove_rows(self, rows):
+        """Remove several rows at once; highest index first keeps swap-and-pop valid."""
+        for i in sorted(rows, reverse=True):
+            self.views[i]._store = None
+            self._swap_pop(i)
+
+    def clear(self):
+        for v in self.views:
+            v._store = None
+        self.views.clear()
+        self.n = 0
+
+
+# ---------- Batched steps (one call per entity type per frame) ----------
+def integrate(store, dt):
+    """x += vx*dt, y += vy*dt for every row."""
+    n, c = store.n, store.cols
+    if not n:
+        return
+    if np is not None:
+        c["x"][:n] += c["vx"][:n] * dt
+        c["y"][:n] += c["vy"][:n] * dt
+        return
+    x, y, vx, vy = c["x"], c["y"], c["vx"], c["vy"]
+    for i in range(n):
+        x[i] += vx[i] * dt
+        y[i] += vy[i] * dt
+
+
+def seek(store, tx, ty, dt):
+    """Move every row toward (tx, ty) by its own speed column."""
+    n, c = store.n, store.cols
+    if not n:
+        return
+    if np is not None:
+        x, y, sp = c["x"][:n], c["y"][:n], c["speed"][:n]
+        ang = np.arctan2(ty - y, tx - x)
+        x += np.cos(ang) * sp * dt
+        y += np.sin(ang) * sp * dt
+        return
+    x, y, sp = c["x"], c["y"], c["speed"]
+    for i in range(n):
+        ang = math.atan2(ty - y[i], tx - x[i])
+        x[i] += math.cos(ang) * sp[i] * dt
+        y[i] += math.sin(ang) * sp[i] * dt
+
+
+def age(store, dt):
+    """life -= dt for every row."""
+    n, life = store.n, store.cols["life"]
+    if not n:
+        return
+    if np is not None:
+        life[:n] -= dt
+        return
+    for i in range(n):
+        life[i] -= dt
+
+
+def expired(store, bounds=None):
+    """Rows whose life ran out or (with bounds=(x0, y0, x1, y1)) that left the area."""
+    n, c = store.n, store.cols
+    if not n:
+        return []
+    if np is not None:
+        dead = c["life"][:n] <= 0
+        if bounds is not None:
+            x0, y0, x1, y1 = bounds
+            x, y = c["x"][:n], c["y"][:n]
+            dead |= (x < x0) | (x > x1) | (y < y0) | (y > y1)
+        return dead.nonzero()[0].tolist()
+    life, x, y = c["life"], c["x"], c["y"]
+    rows = []
+    for i in range(n):
+        if life[i] <= 0:
+            rows.append(i)
+        elif bounds is not None and (x[i] < bounds[0] or x[i] > bounds[2]
+                                     or y[i] < bounds[1] or y[i] > bounds[3]):
+            rows.append(i)
+    return rows
+
+
+def within(store, px, py, r):
+    """Rows (ascending) whose position is closer than r to (px, py)."""
+    n, c = store.n, store.cols
+    if not n:
+        return []
+    if np is not None:
+        d = np.hypot(c["x"][:n] - px, c["y"][:n] - py)
+        return (d < r).nonzero()[0].tolist()
+    x, y = c["x"], c["y"]
+    return [i for i in range(n) if math.hypot(x[i] - px, y[i] - py) < r]
+
+
+def dead_rows(store):
+    """Rows whose alive column was cleared."""
+    n, alive = store.n, store.cols["alive"]
+    if not n:
+        return []
+    if np is not None:
+        return (alive[:n] == 0).nonzero()[0].tolist()
+    return [i for i in range(n) if not alive[i]]
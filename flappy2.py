@@ -2,7 +2,9 @@
 # Flappy_GUI_v2.py  –  pygame Flappy Bird
 # Red bird, sky background, sounds – zero external assets
 # =========================================================
-import pygame, random, math
+import pygame, random
+import soundbank
+import textcache
 
 pygame.mixer.pre_init(44100, -16, 2, 512)
 pygame.init()
@@ -17,25 +19,22 @@ clock = pygame.time.Clock()
 # Sound helper – tiny procedurally generated tones
 # ---------------------------------------------------------
 
-import array   # <-- builtin module, no install needed
-
-def make_sound(freq, duration, volume=0.3, shape='sine'):                       
-    sample_rate = 44100
-    frames = int(sample_rate * duration)
-    arr = array.array('h')   # signed short (16-bit)
-    for t in range(frames):
-        val = int(volume * 32767 *
-                  (math.sin(2 * math.pi * freq * t / sample_rate) if shape == 'sine'
-                   else (1 if int(2 * freq * t / sample_rate) % 2 else -1)))
-        arr.append(val)
-    return pygame.mixer.Sound(arr)  
-
-sfx_flap   = make_sound(800, 0.08, 0.25)
-sfx_point  = make_sound(1000, 0.15, 0.25)
-sfx_die    = make_sound(300, 0.25, 0.4, shape='square')
-
-# Background music (very soft birds-like ambient loop)
-music_tone = make_sound(220, 4.0, 0.05)
+def make_sound(freq, duration, volume=0.3, shape='sine'):
+    # mono buffer, signed short (16-bit)
+    return (freq, duration, volume, shape, False, 1)
+
+sounds = soundbank.load("flappy2", {
+    'sfx_flap':   make_sound(800, 0.08, 0.25),
+    'sfx_point':  make_sound(1000, 0.15, 0.25),
+    'sfx_die':    make_sound(300, 0.25, 0.4, shape='square'),
+    # Background music (very soft birds-like ambient loop)
+    'music_tone': make_sound(220, 4.0, 0.05),
+})
+sfx_flap   = sounds['sfx_flap']
+sfx_point  = sounds['sfx_point']
+sfx_die    = sounds['sfx_die']
+
+music_tone = sounds['music_tone']
 music_tone.play(-1)   # loop forever
 
 # ---------------------------------------------------------
@@ -94,8 +93,8 @@ def main():
     bird = Bird()
     pipes = [Pipe()]
     score = 0
-    font_big = pygame.font.SysFont(None, 48)
-    font_small = pygame.font.SysFont(None, 32)
+    font_big = textcache.font(None, 48)
+    font_small = textcache.font(None, 32)
 
     running = True
     while running:
@@ -146,16 +145,16 @@ def main():
         for p in pipes:
             p.draw()
 
-        score_surf = font_big.render(str(score), True, (255, 255, 255))
+        score_surf = textcache.render(font_big, str(score), (255, 255, 255))
         screen.blit(score_surf, (WIDTH // 2 - score_surf.get_width() // 2, 30))
 
         pygame.display.flip()
         clock.tick(60)
 
     # Game-over screen
-    screen.blit(font_big.render("Game Over", True, (255, 255, 255)),
+    screen.blit(textcache.render(font_big, "Game Over", (255, 255, 255)),
                 (WIDTH // 2 - 80, HEIGHT // 2 - 40))
-    screen.blit(font_small.render(f"Score: {score}", True, (255, 255, 255)),
+    screen.blit(textcache.render(font_small, f"Score: {score}", (255, 255, 255)),
                 (WIDTH // 2 - 40, HEIGHT // 2 + 10))
     pygame.display.flip()
     pygame.time.wait(2000)
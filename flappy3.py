@@ -1,7 +1,7 @@
 import pygame
 import random
-import math
-import array
+import soundbank
+import textcache
 
 pygame.init()
 
@@ -21,29 +21,24 @@ YELLOW = (255, 255, 0)
 
 # ----------- Sound generation ----------
 def make_sound(freq, duration=0.1, volume=0.2, shape="sine"):
-    sr = 44100
-    n = int(sr*duration)
-    buf = array.array("h")
-    for t in range(n):
-        if shape == "sine":
-            s = math.sin(2*math.pi*freq*t/sr)
-        elif shape == "square":
-            s = 1.0 if ((t*freq*2)//sr)%2==0 else -1.0
-        else:
-            s = math.sin(2*math.pi*freq*t/sr)
-        v = int(s*volume*32767)
-        buf.append(v)
-        buf.append(v)
-    return pygame.mixer.Sound(buffer=buf)
-
-jump_sound = make_sound(1000, 0.07)
-score_sound = make_sound(800, 0.1)
-gameover_sound = make_sound(300, 0.3)
-
-# Ambient background loop
-ambient1 = make_sound(220, 0.8, 0.05)
-ambient2 = make_sound(277, 0.8, 0.05)
-ambient3 = make_sound(330, 0.8, 0.05)
+    return (freq, duration, volume, shape)
+
+sounds = soundbank.load("flappy3", {
+    "jump": make_sound(1000, 0.07),
+    "score": make_sound(800, 0.1),
+    "gameover": make_sound(300, 0.3),
+    # Ambient background loop
+    "ambient1": make_sound(220, 0.8, 0.05),
+    "ambient2": make_sound(277, 0.8, 0.05),
+    "ambient3": make_sound(330, 0.8, 0.05),
+})
+jump_sound = sounds["jump"]
+score_sound = sounds["score"]
+gameover_sound = sounds["gameover"]
+
+ambient1 = sounds["ambient1"]
+ambient2 = sounds["ambient2"]
+ambient3 = sounds["ambient3"]
 ambient1.play(loops=-1)
 ambient2.play(loops=-1)
 ambient3.play(loops=-1)
@@ -91,8 +86,8 @@ class Pipe:
 
 # ----------- Utility -----------
 def draw_text(text, size, color, x, y, center=True):
-    font = pygame.font.SysFont("Arial", size, bold=True)
-    surface = font.render(text, True, color)
+    font = textcache.font("Arial", size, bold=True)
+    surface = textcache.render(font, text, color)
     rect = surface.get_rect()
     if center:
         rect.center = (x, y)
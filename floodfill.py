@@ -0,0 +1,199 @@
+# Flood fill — iterative, array-backed connectivity for the bubble grid
+# The board is a flat bytearray of cell codes (row * cols + col, 0 = empty,
+# otherwise a colour code). Fills use an explicit stack, so tall boards can't
+# hit the recursion limit, and mark visited cells with a generation stamp, so
+# no visited set is allocated per call. Neighbours come from an offset table
+# per row parity (bubblegrid.HEX for the staggered board, SQUARE otherwise).
+# detached() is the incremental ceiling check: after a pop it only explores
+# the components next to the removed cells, stopping as soon as one reaches
+# the top row.
+#
+# Benchmark: python floodfill.py [--cols C] [--rows R]
+
+import array, random, sys, time
+
+# (drow, dcol) for even, odd rows; "up" comes last so the stack explores it first
+SQUARE = (((1, 0), (0, -1), (0, 1), (-1, 0)),) * 2
+
+
+class FloodFill:
+    def __init__(self, cols, offsets=SQUARE):
+        self.cols = cols
+        self.offsets = offsets
+        self.stamp = array.array("I")
+        self.gen = 0
+
+    def _begin(self, n):
+        """New generation; cells whose stamp equals it count as visited."""
+        if len(self.stamp) < n:
+            self.stamp.frombytes(bytes(4 * (n - len(self.stamp))))
+        self.gen += 1
+        if self.gen == 2 ** 32:  # wrapped: forget every old mark
+            self.stamp = array.array("I", bytes(4 * len(self.stamp)))
+            self.gen = 1
+        return self.gen
+
+    def fill(self, codes, starts, match=None):
+        """Cells reachable from starts through occupied cells (of code match, if given)."""
+        n, cols = len(codes), self.cols
+        gen = self._begin(n)
+        stamp, offsets = self.stamp, self.offsets
+        stack = []
+        for s in starts:
+            code = codes[s]
+            if code and (match is None or code == match) and stamp[s] != gen:
+                stamp[s] = gen
+                stack.append(s)
+        out = []
+        while stack:
+            i = stack.pop()
+            out.append(i)
+            row, col = divmod(i, cols)
+            for dr, dc in offsets[row & 1]:
+                c = col + dc
+                if c < 0 or c >= cols:
+                    continue
+                j = i + dr * cols + dc
+                if 0 <= j < n and stamp[j] != gen:
+                    code = codes[j]
+                    if code and (match is None or code == match):
+                        stamp[j] = gen
+                        stack.append(j)
+        return out
+
+    def group(self, codes, start):
+        """The same-coloured cluster containing start (empty if start is empty)."""
+        return self.fill(codes, (start,), codes[start] or None) if codes[start] else []
+
+    def neighbours(self, i, n):
+        row, col = divmod(i, self.cols)
+        for dr, dc in self.offsets[row & 1]:
+            c = col + dc
+            j = i + dr * self.cols + dc
+            if 0 <= c < self.cols and 0 <= j < n:
+                yield j
+
+    def detached(self, codes, removed, placed=()):
+        """Cells that lost their path to the top row when removed (already cleared
+        in codes) went away. Only components touching removed cells, plus any
+        placed cells whose anchoring is unknown, are explored; a search stops as
+        soon as it reaches row 0. Each search gets its own stamp, so meeting a
+        cell stamped by an earlier search of this call means that search was
+        anchored (a floating component is closed and can't be met again)."""
+        n, cols = len(codes), self.cols
+        seeds = [j for i in removed for j in self.neighbours(i, n) if codes[j]]
+        seeds.extend(i for i in placed if i < n and codes[i])
+        if self.gen + len(seeds) + 2 >= 2 ** 32:
+            self.gen = 2 ** 32 - 1  # wrap now rather than in the middle of this call
+        base = self._begin(n)
+        stamp, offsets = self.stamp, self.offsets
+        out = []
+        for seed in seeds:
+            if stamp[seed] >= base:
+                continue  # already explored by this call
+            gen = self._begin(n)
+            stamp[seed] = gen
+            stack, comp, anchored = [seed], [], False
+            while stack:
+                i = stack.pop()
+                comp.append(i)
+                if i < cols:
+                    anchored = True
+                    break
+                row, col = divmod(i, cols)
+                for dr, dc in offsets[row & 1]:
+                    c = col + dc
+                    if c < 0 or c >= cols:
+                        continue
+                    j = i + dr * cols + dc
+                    if 0 <= j < n and codes[j]:
+                        if stamp[j] == gen:
+                            continue
+                        if stamp[j] >= base:
+                            anchored = True
+                            break
+                        stamp[j] = gen
+                        stack.append(j)
+                if anchored:
+                    break
+            if not anchored:
+                out.extend(comp)
+        return out
+
+    def floating(self, codes):
+        """Occupied cells with no path to the top row."""
+        self.fill(codes, range(min(self.cols, len(codes))))
+        gen, stamp = self.gen, self.stamp
+        return [i for i, code in enumerate(codes) if code and stamp[i] != gen]
+
+
+# ---------- Benchmark against the recursive, set-based version ----------
+def _recursive_floating(codes, cols):
+    rows = len(codes) // cols
+    visited = set()
+
+    def dfs(r, c):
+        if r < 0 or r >= rows or c < 0 or c >= cols or (r, c) in visited or not codes[r * cols + c]:
+            return
+        visited.add((r, c))
+        dfs(r + 1, c)
+        dfs(r - 1, c)
+        dfs(r, c + 1)
+        dfs(r, c - 1)
+    for c in range(cols):
+        dfs(0, c)
+    return [r * cols + c for r in range(rows) for c in range(cols)
+            if codes[r * cols + c] and (r, c) not in visited]
+
+
+def _arg(name, default, cast=int):
+    if name in sys.argv:
+        return cast(sys.argv[sys.argv.index(name) + 1])
+    return default
+
+
+def main():
+    cols, max_rows = _arg("--cols", 16), _arg("--rows", 8000)
+    rng = random.Random(1)
+    rows = 8
+    while rows <= max_rows:
+        # dense random board: 85% occupied, 4 colours
+        codes = bytearray(rng.randrange(1, 5) if rng.random() < 0.85 else 0 for _ in range(rows * cols))
+        ff = FloodFill(cols)
+        t = time.perf_counter()
+        float_cells = ff.floating(codes)
+        t_float = time.perf_counter() - t
+        t = time.perf_counter()
+        for start in range(0, len(codes), 97):
+            ff.group(codes, start)
+        t_group = (time.perf_counter() - t) / len(range(0, len(codes), 97))
+        t = time.perf_counter()
+        try:
+            ref = _recursive_floating(codes, cols)
+            t_ref = f"{(time.perf_counter() - t) * 1e3:8.2f} ms"
+            assert sorted(ref) == sorted(float_cells)
+        except RecursionError:
+            t_ref = "RecursionError"
+        # pop a cluster in the middle of an anchored board: full rescan vs incremental
+        anchored = bytearray(codes)
+        for i in float_cells:
+            anchored[i] = 0
+        start = max(range(len(anchored) // 2, len(anchored) // 2 + 64), key=lambda i: len(ff.group(anchored, i)))
+        popped = ff.group(anchored, start)
+        for i in popped:
+            anchored[i] = 0
+        t = time.perf_counter()
+        full = ff.floating(anchored)
+        t_full = time.perf_counter() - t
+        t = time.perf_counter()
+        inc = ff.detached(anchored, popped)
+        t_inc = time.perf_counter() - t
+        assert sorted(full) == sorted(inc)
+        print(f"{rows:6d} rows: floating {t_float * 1e3:8.2f} ms (recursive: {t_ref}), "
+              f"group {t_group * 1e6:7.1f} us, after a {len(popped)}-cell pop: "
+              f"rescan {t_full * 1e3:7.2f} ms, incremental {t_inc * 1e3:6.3f} ms ({len(inc)} dropped)")
+        rows *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# Render layers — cached static surfaces and dirty-rectangle redraws
+# A StaticLayer paints something that never changes (backgrounds, boards) once
+# into a display-format surface and hands it back until its size or key
+# changes. DirtyRects restores only the areas drawn last frame from such a
+# layer and pushes just those areas to the display.
+
+import pygame
+
+
+class StaticLayer:
+    def __init__(self, paint):
+        self.paint = paint      # paint(surface) draws the layer contents
+        self.surface = None
+        self.key = None
+
+    def get(self, size, key=()):
+        """The cached surface, rebuilt when size or key (e.g. grid settings) differ."""
+        if self.surface is None or self.key != (size, key):
+            surf = pygame.Surface(size)
+            if pygame.display.get_surface() is not None:
+                surf = surf.convert()
+            self.paint(surf)
+            self.surface, self.key = surf, (size, key)
+        return self.surface
+
+    def blit(self, dest, key=()):
+        return dest.blit(self.get(dest.get_size(), key), (0, 0))
+
+
+class DirtyRects:
+    """Track what was drawn over a static layer so only those areas get redrawn."""
+
+    def __init__(self):
+        self.prev = []
+
+    def restore(self, dest, layer):
+        """Paint last frame's rects back from the layer (an unchanged background)."""
+        if self.prev:
+            dest.blits([(layer, r, r) for r in self.prev], doreturn=False)
+
+    def flush(self, rects):
+        """Push last frame's and this frame's rects to the display."""
+        rects = [r for r in rects if r]
+        pygame.display.update(self.prev + rects)
+        self.prev = rects
+
+    def reset(self, rects=()):
+        """After a full-screen flip: only these rects sit on top of the background."""
+        self.prev = [r for r in rects if r]
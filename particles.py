@@ -0,0 +1,146 @@
+# Particles — pooled, array-backed particle system with cached sprites
+# Particles live in fixed-capacity columns (NumPy arrays when NumPy is
+# installed, array.array otherwise) instead of one object each. Circle sprites
+# are prerendered per (color, size, alpha bucket) and the whole pool is drawn
+# with a single Surface.blits() call. Emission is capped by the pool size and
+# by a per-update budget, so an emitter left running every frame stays bounded.
+
+import random, array
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # pure-array fallback
+    np = None
+
+CAPACITY = 1024    # most particles alive at once
+RATE = 256         # most particles spawned between two update() calls
+ALPHA_STEPS = 16   # fade levels a sprite's alpha is quantized to
+MIN_SIZE = 0.5     # particles shrink until this, then disappear
+
+_FIELDS = ("x", "y", "vx", "vy", "life", "max_life", "size")
+_sprites = {}
+
+
+def _alloc(n, typecode="d"):
+    if np is not None:
+        return np.zeros(n, dtype="float64" if typecode == "d" else "int64")
+    return array.array(typecode, bytes(8 * n))
+
+
+def sprite(color, size, level):
+    """Circle of radius size at alpha level/ALPHA_STEPS, rendered once and reused."""
+    key = (color, size, level)
+    surf = _sprites.get(key)
+    if surf is None:
+        surf = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+        alpha = 255 * level // ALPHA_STEPS
+        pygame.draw.circle(surf, (*color[:3], alpha), (size, size), size)
+        _sprites[key] = surf
+    return surf
+
+
+class ParticleSystem:
+    def __init__(self, capacity=CAPACITY, rate=RATE):
+        self.capacity = capacity
+        self.rate = rate
+        self.budget = rate
+        self.n = 0
+        self.cols = {name: _alloc(capacity) for name in _FIELDS}
+        self.color = _alloc(capacity, "q")   # index into self.palette
+        self.palette = []
+        self._color_ids = {}
+
+    def __len__(self):
+        return self.n
+
+    def _color_id(self, color):
+        color = tuple(color[:3])
+        i = self._color_ids.get(color)
+        if i is None:
+            i = self._color_ids[color] = len(self.palette)
+            self.palette.append(color)
+        return i
+
+    def _emit(self, x, y, color, count, speed, life_lo, life_hi):
+        count = min(count, self.budget, self.capacity - self.n)
+        if count <= 0:
+            return 0
+        self.budget -= count
+        cid = self._color_id(color)
+        c = self.cols
+        for i in range(self.n, self.n + count):
+            life = random.uniform(life_lo, life_hi)
+            c["x"][i], c["y"][i] = x, y
+            c["vx"][i] = random.uniform(-speed, speed)
+            c["vy"][i] = random.uniform(-speed, speed)
+            c["life"][i] = c["max_life"][i] = life
+            c["size"][i] = random.uniform(2, 6)
+            self.color[i] = cid
+        self.n += count
+        return count
+
+    def add_particle(self, x, y, color, count=10):
+        return self._emit(x, y, color, count, 3, 30, 60)
+
+    def add_explosion(self, x, y, color, count=20):
+        return self._emit(x, y, color, count, 8, 20, 40)
+
+    def clear(self):
+        self.n = 0
+        self.budget = self.rate
+
+    def update(self, dt=1):
+        """Advance every particle by dt frames and drop the ones that faded out."""
+        self.budget = self.rate
+        n, c = self.n, self.cols
+        if not n:
+            return
+        if np is not None:
+            c["x"][:n] += c["vx"][:n] * dt
+            c["y"][:n] += c["vy"][:n] * dt
+            c["life"][:n] -= dt
+            c["size"][:n] *= 0.98 ** dt
+            keep = (c["life"][:n] > 0) & (c["size"][:n] > MIN_SIZE)
+            k = int(keep.sum())
+            if k != n:
+                for col in (*c.values(), self.color):
+                    col[:k] = col[:n][keep]
+                self.n = k
+            return
+        x, y, vx, vy = c["x"], c["y"], c["vx"], c["vy"]
+        life, size, cols = c["life"], c["size"], (*c.values(), self.color)
+        shrink = 0.98 ** dt
+        k = 0
+        for i in range(n):
+            x[i] += vx[i] * dt
+            y[i] += vy[i] * dt
+            life[i] -= dt
+            size[i] *= shrink
+            if life[i] > 0 and size[i] > MIN_SIZE:
+                if k != i:
+                    for col in cols:
+                        col[k] = col[i]
+                k += 1
+        self.n = k
+
+    def draw(self, screen):
+        n, c = self.n, self.cols
+        if not n:
+            return
+        if np is not None:
+            size = np.maximum(1, c["size"][:n].astype("int64"))
+            level = (c["life"][:n] / c["max_life"][:n] * ALPHA_STEPS + 0.5).astype("int64")
+            xs = (c["x"][:n] - size).astype("int64").tolist()
+            ys = (c["y"][:n] - size).astype("int64").tolist()
+            items = zip(self.color[:n].tolist(), size.tolist(), level.tolist(), xs, ys)
+        else:
+            items = []
+            for i in range(n):
+                s = max(1, int(c["size"][i]))
+                level = int(c["life"][i] / c["max_life"][i] * ALPHA_STEPS + 0.5)
+                items.append((self.color[i], s, level,
+                              int(c["x"][i] - s), int(c["y"][i] - s)))
+        palette = self.palette
+        screen.blits([(sprite(palette[ci], s, lv), (px, py))
+                      for ci, s, lv, px, py in items if lv > 0], doreturn=False)
@@ -2,9 +2,19 @@ import pygame
 import sys
 import random
 import math
+import time
+from collections import deque
+import textcache
+from particles import ParticleSystem
+from layers import StaticLayer
+from snake_autopilot import Autopilot
 
-# Initialize Pygame
-pygame.init()
+LOD_CELL = 8  # below this many pixels per cell the board is drawn as one pixel map
+BODY_LEVELS = 64  # body shades in the sprite atlas, from tail (0.4) to neck (1.0)
+HEAD_PAD = 8  # head sprites are padded so eyes on small cells are not clipped
+TURN_BUFFER = 3  # key presses remembered between two moves
+ARROW_KEYS = {pygame.K_UP: (0, -1), pygame.K_DOWN: (0, 1),
+              pygame.K_LEFT: (-1, 0), pygame.K_RIGHT: (1, 0)}
 
 class Colors:
     BACKGROUND = (15, 15, 35)
@@ -23,54 +33,31 @@ class Colors:
     EYE_BLACK = (0, 0, 0)
     TONGUE = (220, 50, 50)
 
-class Particle:
-    def __init__(self, x, y, color, velocity, lifetime):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.velocity = velocity
-        self.lifetime = lifetime
-        self.max_lifetime = lifetime
-        self.size = random.uniform(2, 6)
-        
-    def update(self, dt):
-        self.x += self.velocity[0] * dt * 60
-        self.y += self.velocity[1] * dt * 60
-        self.lifetime -= dt * 60
-        self.size *= 0.98
-        
-    def draw(self, screen):
-        if self.lifetime > 0:
-            alpha = max(0, min(255, int(255 * (self.lifetime / self.max_lifetime))))
-            size = max(1, int(self.size))
-            particle_surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(particle_surface, (*self.color[:3], alpha), (size, size), size)
-            screen.blit(particle_surface, (int(self.x - size), int(self.y - size)))
-
-class ParticleSystem:
-    def __init__(self):
-        self.particles = []
-        
-    def add_particle(self, x, y, color, count=10):
-        for _ in range(count):
-            velocity = [random.uniform(-3, 3), random.uniform(-3, 3)]
-            lifetime = random.uniform(30, 60)
-            self.particles.append(Particle(x, y, color, velocity, lifetime))
-            
-    def add_explosion(self, x, y, color, count=20):
-        for _ in range(count):
-            velocity = [random.uniform(-8, 8), random.uniform(-8, 8)]
-            lifetime = random.uniform(20, 40)
-            self.particles.append(Particle(x, y, color, velocity, lifetime))
-            
-    def update(self):
-        self.particles = [p for p in self.particles if p.lifetime > 0 and p.size > 0.5]
-        for particle in self.particles:
-            particle.update(1)
-            
-    def draw(self, screen):
-        for particle in self.particles:
-            particle.draw(screen)
+class FreeCells:
+    """Cells (as y * width + x) not covered by the snake, with O(1) add, remove and
+    random pick: a dense list of free cells plus each cell's slot in that list."""
+    
+    def __init__(self, width, height):
+        self.cells = list(range(width * height))
+        self.slot = list(range(width * height))  # -1 once the cell is taken
+        
+    def __len__(self):
+        return len(self.cells)
+        
+    def remove(self, cell):
+        i = self.slot[cell]
+        last = self.cells.pop()
+        if last != cell:
+            self.cells[i] = last
+            self.slot[last] = i
+        self.slot[cell] = -1
+        
+    def add(self, cell):
+        self.slot[cell] = len(self.cells)
+        self.cells.append(cell)
+        
+    def pick(self, rng=random):
+        return self.cells[rng.randrange(len(self.cells))] if self.cells else None
 
 class Snake:
     def __init__(self, grid_width, grid_height):
@@ -78,26 +65,42 @@ class Snake:
         self.grid_height = grid_height
         self.reset()
         
-    def reset(self):
+    def reset(self, body=None):
         start_x = self.grid_width // 2
         start_y = self.grid_height // 2
-        self.body = [(start_x, start_y), (start_x - 1, start_y), (start_x - 2, start_y)]
+        if body is None:
+            body = [(start_x, start_y), (start_x - 1, start_y), (start_x - 2, start_y)]
+        # deque: O(1) push at the head and pop at the tail
+        self.body = deque(body)
+        # how many body segments sit on each cell; 2 means the head ran into the body
+        self.occupied = bytearray(self.grid_width * self.grid_height)
+        self.free = FreeCells(self.grid_width, self.grid_height)
+        for x, y in self.body:
+            cell = y * self.grid_width + x
+            if not self.occupied[cell]:
+                self.free.remove(cell)
+            self.occupied[cell] += 1
         self.direction = (1, 0)  # Right
         self.next_direction = (1, 0)
         self.grow_pending = 0
-        
-    def update(self):
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_UP] and self.direction != (0, 1):
-            self.next_direction = (0, -1)
-        elif keys[pygame.K_DOWN] and self.direction != (0, -1):
-            self.next_direction = (0, 1)
-        elif keys[pygame.K_LEFT] and self.direction != (1, 0):
-            self.next_direction = (-1, 0)
-        elif keys[pygame.K_RIGHT] and self.direction != (-1, 0):
-            self.next_direction = (1, 0)
+        self.turns = deque()  # buffered turns, one applied per move
+        
+    def queue_turn(self, direction):
+        """Buffer a key press so quick sequences (e.g. up, left within one move)
+        become consecutive turns; repeats and reversals onto the neck are dropped."""
+        prev = self.turns[-1] if self.turns else self.direction
+        if len(self.turns) < TURN_BUFFER and direction != prev and \
+                direction != (-prev[0], -prev[1]):
+            self.turns.append(direction)
+            
+    def steer(self, direction):
+        """Turn on the next move, unless that would reverse onto the neck."""
+        if direction != (-self.direction[0], -self.direction[1]):
+            self.next_direction = direction
             
     def move(self):
+        if self.turns:
+            self.next_direction = self.turns.popleft()
         self.direction = self.next_direction
         head_x, head_y = self.body[0]
         dx, dy = self.direction
@@ -108,12 +111,20 @@ class Snake:
             new_head[1] < 0 or new_head[1] >= self.grid_height):
             return "WALL_COLLISION"
             
-        self.body.insert(0, new_head)
+        self.body.appendleft(new_head)
+        cell = new_head[1] * self.grid_width + new_head[0]
+        if not self.occupied[cell]:
+            self.free.remove(cell)
+        self.occupied[cell] += 1
         
         if self.grow_pending > 0:
             self.grow_pending -= 1
         else:
-            self.body.pop()
+            tail_x, tail_y = self.body.pop()
+            cell = tail_y * self.grid_width + tail_x
+            self.occupied[cell] -= 1
+            if not self.occupied[cell]:
+                self.free.add(cell)
             
         return "OK"
         
@@ -121,41 +132,51 @@ class Snake:
         self.grow_pending += 1
         
     def check_self_collision(self):
-        head = self.body[0]
-        return head in self.body[1:]
+        head_x, head_y = self.body[0]
+        return self.occupied[head_y * self.grid_width + head_x] > 1
         
     def get_head_position(self):
         return self.body[0]
 
 class Food:
-    def __init__(self, grid_width, grid_height):
+    def __init__(self, grid_width, grid_height, rng=random):
         self.grid_width = grid_width
         self.grid_height = grid_height
+        self.rng = rng  # a seeded random.Random makes food placement reproducible
         self.position = self.random_position()
         
     def random_position(self):
-        return (random.randint(0, self.grid_width - 1), random.randint(0, self.grid_height - 1))
+        return (self.rng.randint(0, self.grid_width - 1), self.rng.randint(0, self.grid_height - 1))
         
-    def respawn(self, snake_body):
-        while True:
-            self.position = self.random_position()
-            if self.position not in snake_body:
-                break
+    def respawn(self, snake):
+        """Place the food on a random free cell; None when the snake fills the board."""
+        cell = snake.free.pick(self.rng)
+        self.position = None if cell is None else (cell % self.grid_width, cell // self.grid_width)
+        return self.position
 
 class ModernSnakeGame:
-    def __init__(self):
+    def __init__(self, grid_width=32, grid_height=24, cell_size=25, idle_render=True):
+        # Initialize Pygame here rather than on import, so snake_env can use the
+        # game logic headless
+        pygame.init()
+        
         self.WINDOW_WIDTH = 800
         self.WINDOW_HEIGHT = 600
-        self.GRID_WIDTH = 32
-        self.GRID_HEIGHT = 24
-        self.CELL_SIZE = 25
+        self.GRID_WIDTH = grid_width
+        self.GRID_HEIGHT = grid_height
+        self.CELL_SIZE = cell_size
+        # boards bigger than the window scroll with the head; tiny cells skip the
+        # per-segment shapes and grid lines (level of detail)
+        self.camera = (0, 0)
+        self.detailed = cell_size >= LOD_CELL
+        self.snake_palette = [(20, 20, 40)] + [Colors.SNAKE_BODY] * 254 + [Colors.SNAKE_HEAD]
         
         self.screen = pygame.display.set_mode((self.WINDOW_WIDTH, self.WINDOW_HEIGHT))
         pygame.display.set_caption("Snake Game - Wall Collision Mode")
         
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
+        self.font = textcache.font(None, 36)
+        self.small_font = textcache.font(None, 24)
         
         self.snake = Snake(self.GRID_WIDTH, self.GRID_HEIGHT)
         self.food = Food(self.GRID_WIDTH, self.GRID_HEIGHT)
@@ -167,25 +188,92 @@ class ModernSnakeGame:
         self.move_delay = 150
         
         self.wall_collision_pos = None
+        self.autopilot = None  # Autopilot while A is toggled on
+        # idle rendering: only redraw after a move, an event, live particles or a
+        # visible change in the food's pulse
+        self.idle_render = idle_render
+        self.needs_redraw = True
+        self.glow_radius = None
         self.background = self.create_gradient_background()
+        self.board = StaticLayer(self.paint_board)
+        self.build_sprites()
         
     def create_gradient_background(self):
         background = pygame.Surface((self.WINDOW_WIDTH, self.WINDOW_HEIGHT))
-        for y in range(self.WINDOW_HEIGHT):
-            color_value = min(25, 15 + int((y / self.WINDOW_HEIGHT) * 10))
-            color = (color_value, color_value, min(45, color_value + 20))
-            pygame.draw.line(background, color, (0, y), (self.WINDOW_WIDTH, y))
+        self.paint_gradient(background)
         return background
         
-    def draw_snake_head(self, x, y, direction):
-        pixel_x = x * self.CELL_SIZE
-        pixel_y = y * self.CELL_SIZE
-        
+    def paint_gradient(self, surf):
+        # shade by window height; rows below the window keep the bottom colour
+        for y in range(surf.get_height()):
+            color_value = min(25, 15 + int((y / self.WINDOW_HEIGHT) * 10))
+            color = (color_value, color_value, min(45, color_value + 20))
+            pygame.draw.line(surf, color, (0, y), (surf.get_width(), y))
+        
+    def paint_board(self, surf):
+        # gradient, game area and grid lines never change during play, so they are
+        # composited once here and blitted as a single surface every frame. The
+        # surface is one cell larger than the window, so a scrolled view is the
+        # same surface shifted by the camera's offset within a cell. The gradient
+        # covers that extra cell too, for boards that don't fill it.
+        self.paint_gradient(surf)
+        game_area = pygame.Rect(0, 0, self.GRID_WIDTH * self.CELL_SIZE, self.GRID_HEIGHT * self.CELL_SIZE)
+        pygame.draw.rect(surf, (20, 20, 40), game_area)
+        
+        if not self.detailed:
+            return
+        for x in range(min(self.GRID_WIDTH, surf.get_width() // self.CELL_SIZE + 1)):
+            for y in range(min(self.GRID_HEIGHT, surf.get_height() // self.CELL_SIZE + 1)):
+                rect = pygame.Rect(x * self.CELL_SIZE, y * self.CELL_SIZE, self.CELL_SIZE, self.CELL_SIZE)
+                pygame.draw.rect(surf, Colors.GRID, rect, 1)
+        
+    def draw_board(self):
+        size = (self.WINDOW_WIDTH + self.CELL_SIZE, self.WINDOW_HEIGHT + self.CELL_SIZE)
+        board = self.board.get(size, (self.GRID_WIDTH, self.GRID_HEIGHT, self.CELL_SIZE))
+        cam_x, cam_y = self.camera
+        self.screen.blit(board, (-(cam_x % self.CELL_SIZE), -(cam_y % self.CELL_SIZE)))
+        
+    def update_camera(self):
+        """Center the view on the head, clamped to the board (fixed when the board fits)."""
+        head_x, head_y = self.snake.body[0]
+        half = self.CELL_SIZE // 2
+        board_w, board_h = self.GRID_WIDTH * self.CELL_SIZE, self.GRID_HEIGHT * self.CELL_SIZE
+        cam_x = max(0, min(board_w - self.WINDOW_WIDTH, head_x * self.CELL_SIZE + half - self.WINDOW_WIDTH // 2))
+        cam_y = max(0, min(board_h - self.WINDOW_HEIGHT, head_y * self.CELL_SIZE + half - self.WINDOW_HEIGHT // 2))
+        self.camera = (cam_x, cam_y)
+        
+    def to_screen(self, x, y):
+        return x * self.CELL_SIZE - self.camera[0], y * self.CELL_SIZE - self.camera[1]
+        
+    def visible_cells(self):
+        """(first column, first row, columns, rows) of the board inside the window."""
+        col, row = self.camera[0] // self.CELL_SIZE, self.camera[1] // self.CELL_SIZE
+        cols = min(self.GRID_WIDTH - col, self.WINDOW_WIDTH // self.CELL_SIZE + 2)
+        rows = min(self.GRID_HEIGHT - row, self.WINDOW_HEIGHT // self.CELL_SIZE + 2)
+        return col, row, cols, rows
+        
+    def build_sprites(self):
+        """Snake atlas for the current cell size: a head per direction and a body
+        sprite per shade, so drawing a segment is a lookup plus a blit."""
+        size = self.CELL_SIZE
+        self.head_sprites = {}
+        for direction in ((1, 0), (-1, 0), (0, -1), (0, 1)):
+            surf = pygame.Surface((size + 2 * HEAD_PAD, size + 2 * HEAD_PAD), pygame.SRCALPHA)
+            self.paint_snake_head(surf, HEAD_PAD, HEAD_PAD, direction)
+            self.head_sprites[direction] = surf.convert_alpha()
+        self.body_sprites = []
+        for level in range(BODY_LEVELS):
+            intensity = 0.4 + 0.6 * level / (BODY_LEVELS - 1)
+            surf = pygame.Surface((size, size), pygame.SRCALPHA)
+            self.paint_snake_body(surf, 0, 0, intensity)
+            self.body_sprites.append(surf.convert_alpha())
+        
+    def paint_snake_head(self, surf, pixel_x, pixel_y, direction):
         head_rect = pygame.Rect(pixel_x + 2, pixel_y + 2, self.CELL_SIZE - 4, self.CELL_SIZE - 4)
-        pygame.draw.ellipse(self.screen, Colors.SNAKE_HEAD, head_rect)
+        pygame.draw.ellipse(surf, Colors.SNAKE_HEAD, head_rect)
         
         highlight_rect = pygame.Rect(pixel_x + 4, pixel_y + 4, self.CELL_SIZE - 12, self.CELL_SIZE // 3)
-        pygame.draw.ellipse(self.screen, Colors.SNAKE_BELLY, highlight_rect)
+        pygame.draw.ellipse(surf, Colors.SNAKE_BELLY, highlight_rect)
         
         center_x = pixel_x + self.CELL_SIZE // 2
         center_y = pixel_y + self.CELL_SIZE // 2
@@ -206,40 +294,76 @@ class ModernSnakeGame:
             left_eye = (center_x - 4, center_y + 3)
             right_eye = (center_x + 4, center_y + 3)
         
-        pygame.draw.circle(self.screen, Colors.EYE_WHITE, left_eye, eye_size)
-        pygame.draw.circle(self.screen, Colors.EYE_WHITE, right_eye, eye_size)
-        pygame.draw.circle(self.screen, Colors.EYE_BLACK, left_eye, pupil_size)
-        pygame.draw.circle(self.screen, Colors.EYE_BLACK, right_eye, pupil_size)
-        
-    def draw_snake_body(self, x, y, index):
-        pixel_x = x * self.CELL_SIZE
-        pixel_y = y * self.CELL_SIZE
+        pygame.draw.circle(surf, Colors.EYE_WHITE, left_eye, eye_size)
+        pygame.draw.circle(surf, Colors.EYE_WHITE, right_eye, eye_size)
+        pygame.draw.circle(surf, Colors.EYE_BLACK, left_eye, pupil_size)
+        pygame.draw.circle(surf, Colors.EYE_BLACK, right_eye, pupil_size)
         
+    def paint_snake_body(self, surf, pixel_x, pixel_y, intensity):
         body_rect = pygame.Rect(pixel_x + 3, pixel_y + 3, self.CELL_SIZE - 6, self.CELL_SIZE - 6)
-        intensity = max(0.4, 1 - (index / len(self.snake.body)) * 0.6)
         body_color = tuple(max(0, min(255, int(c * intensity))) for c in Colors.SNAKE_BODY)
         
-        pygame.draw.ellipse(self.screen, body_color, body_rect)
+        pygame.draw.ellipse(surf, body_color, body_rect)
                 
     def draw_snake(self):
-        for i, (x, y) in enumerate(self.snake.body):
+        if not self.detailed:
+            self.draw_snake_pixels()
+            return
+        col, row, cols, rows = self.visible_cells()
+        body, bodies = self.snake.body, self.body_sprites
+        n, top = len(body), BODY_LEVELS - 1
+        cam_x, cam_y, size = self.camera[0], self.camera[1], self.CELL_SIZE
+        batch = []
+        for i, (x, y) in enumerate(body):
+            if not (col <= x < col + cols and row <= y < row + rows):
+                continue
             if i == 0:
-                self.draw_snake_head(x, y, self.snake.direction)
+                batch.append((self.head_sprites[self.snake.direction],
+                              (x * size - cam_x - HEAD_PAD, y * size - cam_y - HEAD_PAD)))
             else:
-                self.draw_snake_body(x, y, i)
+                # intensity 1 - 0.6 * i / n, as a shade index into the atlas
+                batch.append((bodies[((n - i) * top + n // 2) // n], (x * size - cam_x, y * size - cam_y)))
+        self.screen.blits(batch, doreturn=False)
                 
+    def draw_snake_pixels(self):
+        # one byte per visible cell straight from the occupancy grid (0 = empty,
+        # 255 = head), turned into an 8-bit surface and scaled up in a single blit
+        col, row, cols, rows = self.visible_cells()
+        occupied, width = self.snake.occupied, self.GRID_WIDTH
+        if cols == width:
+            cells = occupied[row * width:(row + rows) * width]
+        else:
+            cells = bytearray().join(occupied[(row + r) * width + col:(row + r) * width + col + cols]
+                                     for r in range(rows))
+        head_x, head_y = self.snake.body[0]
+        if col <= head_x < col + cols and row <= head_y < row + rows:
+            cells[(head_y - row) * cols + head_x - col] = 255
+        pixels = pygame.image.frombuffer(cells, (cols, rows), "P")
+        pixels.set_palette(self.snake_palette)
+        pixels.set_colorkey(0)
+        scaled = pygame.transform.scale(pixels, (cols * self.CELL_SIZE, rows * self.CELL_SIZE))
+        self.screen.blit(scaled, self.to_screen(col, row))
+                
+    def food_glow_radius(self):
+        pulse = abs(math.sin(pygame.time.get_ticks() * 0.005)) * 3 + 2
+        return int(self.CELL_SIZE//2 + pulse)
+        
     def draw_food(self):
         x, y = self.food.position
-        center_x = x * self.CELL_SIZE + self.CELL_SIZE // 2
-        center_y = y * self.CELL_SIZE + self.CELL_SIZE // 2
+        pixel_x, pixel_y = self.to_screen(x, y)
+        if not self.detailed:
+            self.screen.fill(Colors.FOOD, (pixel_x, pixel_y, self.CELL_SIZE, self.CELL_SIZE))
+            return
+        center_x = pixel_x + self.CELL_SIZE // 2
+        center_y = pixel_y + self.CELL_SIZE // 2
         
-        pulse = abs(math.sin(pygame.time.get_ticks() * 0.005)) * 3 + 2
+        radius = self.food_glow_radius()
         
         glow_surface = pygame.Surface((self.CELL_SIZE + 20, self.CELL_SIZE + 20), pygame.SRCALPHA)
         pygame.draw.circle(glow_surface, (*Colors.FOOD_GLOW, 100), 
                          (self.CELL_SIZE//2 + 10, self.CELL_SIZE//2 + 10), 
-                         self.CELL_SIZE//2 + pulse)
-        self.screen.blit(glow_surface, (x * self.CELL_SIZE - 10, y * self.CELL_SIZE - 10))
+                         radius)
+        self.screen.blit(glow_surface, (pixel_x - 10, pixel_y - 10))
         
         pygame.draw.circle(self.screen, Colors.FOOD, 
                          (center_x, center_y), 
@@ -250,7 +374,7 @@ class ModernSnakeGame:
         overlay.fill((*Colors.UI_PANEL, 220))
         self.screen.blit(overlay, (0, 0))
         
-        title_text = self.font.render("🐍 Snake Game - Wall Mode", True, Colors.TEXT)
+        title_text = textcache.render(self.font, "🐍 Snake Game - Wall Mode", Colors.TEXT)
         title_rect = title_text.get_rect(center=(self.WINDOW_WIDTH // 2, self.WINDOW_HEIGHT // 2 - 80))
         self.screen.blit(title_text, title_rect)
         
@@ -258,11 +382,12 @@ class ModernSnakeGame:
             "🎮 Use ARROW KEYS to control the snake",
             "🧱 Hitting walls = GAME OVER",
             "🍎 Eat the glowing food to grow",
+            "🤖 Press A to toggle the autopilot",
             "🚀 Press SPACE to start"
         ]
         
         for i, instruction in enumerate(instructions):
-            text = self.small_font.render(instruction, True, Colors.TEXT)
+            text = textcache.render(self.small_font, instruction, Colors.TEXT)
             rect = text.get_rect(center=(self.WINDOW_WIDTH // 2, self.WINDOW_HEIGHT // 2 + 20 + i * 30))
             self.screen.blit(text, rect)
             
@@ -272,49 +397,82 @@ class ModernSnakeGame:
         self.screen.blit(overlay, (0, 0))
         
         if self.wall_collision_pos:
-            fx, fy = self.wall_collision_pos
-            center_x = fx * self.CELL_SIZE + self.CELL_SIZE // 2
-            center_y = fy * self.CELL_SIZE + self.CELL_SIZE // 2
+            pixel_x, pixel_y = self.to_screen(*self.wall_collision_pos)
+            center_x = pixel_x + self.CELL_SIZE // 2
+            center_y = pixel_y + self.CELL_SIZE // 2
+            # bounded by the pool's capacity and per-frame rate, however long this screen stays up
             self.particles.add_explosion(center_x, center_y, Colors.GAME_OVER, 50)
+            self.particles.draw(self.screen)
         
-        game_over_text = self.font.render("💥 Wall Collision!", True, Colors.GAME_OVER)
+        game_over_text = textcache.render(self.font, "💥 Wall Collision!", Colors.GAME_OVER)
         game_over_rect = game_over_text.get_rect(center=(self.WINDOW_WIDTH // 2, self.WINDOW_HEIGHT // 2 - 50))
         self.screen.blit(game_over_text, game_over_rect)
         
-        score_text = self.small_font.render(f"Final Score: {self.score}", True, Colors.TEXT)
+        score_text = textcache.render(self.small_font, f"Final Score: {self.score}", Colors.TEXT)
         score_rect = score_text.get_rect(center=(self.WINDOW_WIDTH // 2, self.WINDOW_HEIGHT // 2))
         self.screen.blit(score_text, score_rect)
         
-        restart_text = self.small_font.render("Press SPACE to restart", True, Colors.TEXT)
+        restart_text = textcache.render(self.small_font, "Press SPACE to restart", Colors.TEXT)
         restart_rect = restart_text.get_rect(center=(self.WINDOW_WIDTH // 2, self.WINDOW_HEIGHT // 2 + 50))
         self.screen.blit(restart_text, restart_rect)
         
+    def draw_board_cleared(self):
+        overlay = pygame.Surface((self.WINDOW_WIDTH, self.WINDOW_HEIGHT), pygame.SRCALPHA)
+        overlay.fill((*Colors.UI_PANEL, 220))
+        self.screen.blit(overlay, (0, 0))
+        
+        lines = [
+            (self.font, "🏆 Board Cleared!", Colors.WALL_WARNING, -50),
+            (self.small_font, f"Final Score: {self.score}", Colors.TEXT, 0),
+            (self.small_font, "Press SPACE to restart", Colors.TEXT, 50),
+        ]
+        for font, line, color, dy in lines:
+            text = textcache.render(font, line, color)
+            rect = text.get_rect(center=(self.WINDOW_WIDTH // 2, self.WINDOW_HEIGHT // 2 + dy))
+            self.screen.blit(text, rect)
+        
     def draw_hud(self):
-        score_text = self.font.render(f"Score: {self.score}", True, Colors.TEXT)
+        score_text = textcache.render(self.font, f"Score: {self.score}", Colors.TEXT)
         self.screen.blit(score_text, (20, 20))
+        if self.autopilot:
+            pilot_text = textcache.render(self.small_font, f"AUTOPILOT  {self.autopilot.us_per_tick:.0f} us/tick",
+                                          Colors.WALL_WARNING)
+            self.screen.blit(pilot_text, (20, 52))
         
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return False
             elif event.type == pygame.KEYDOWN:
-                if self.game_state == "MENU" and event.key == pygame.K_SPACE:
+                if event.key == pygame.K_a:
+                    self.toggle_autopilot()
+                elif self.game_state == "MENU" and event.key == pygame.K_SPACE:
                     self.game_state = "PLAYING"
-                elif self.game_state == "GAME_OVER" and event.key == pygame.K_SPACE:
+                elif self.game_state in ("GAME_OVER", "WON") and event.key == pygame.K_SPACE:
                     self.reset_game()
-                elif self.game_state == "PLAYING":
-                    self.snake.update()
+                elif self.game_state == "PLAYING" and event.key in ARROW_KEYS and not self.autopilot:
+                    self.snake.queue_turn(ARROW_KEYS[event.key])
+            # any event (keys, window exposure, focus) may change what is on screen
+            self.needs_redraw = True
                     
         return True
         
+    def toggle_autopilot(self):
+        self.autopilot = None if self.autopilot else Autopilot(self.GRID_WIDTH, self.GRID_HEIGHT)
+        if self.autopilot:
+            # key presses buffered before A would override the autopilot's moves
+            self.snake.turns.clear()
+        
     def reset_game(self):
         self.snake.reset()
-        self.food.respawn(self.snake.body)
+        self.food.respawn(self.snake)
         self.score = 0
         self.game_state = "PLAYING"
         self.move_delay = 150
-        self.particles = ParticleSystem()
+        self.particles.clear()
         self.wall_collision_pos = None
+        if self.autopilot:
+            self.autopilot = Autopilot(self.GRID_WIDTH, self.GRID_HEIGHT)
         
     def run(self):
         running = True
@@ -328,6 +486,8 @@ class ModernSnakeGame:
                 self.move_timer += dt
                 
                 if self.move_timer >= self.move_delay:
+                    if self.autopilot:
+                        self.snake.next_direction = self.autopilot.choose(self.snake, self.food.position)
                     move_result = self.snake.move()
                     
                     if move_result == "WALL_COLLISION":
@@ -340,26 +500,34 @@ class ModernSnakeGame:
                         if self.snake.get_head_position() == self.food.position:
                             self.score += 1
                             self.snake.grow()
-                            self.food.respawn(self.snake.body)
+                            if self.food.respawn(self.snake) is None:
+                                self.game_state = "WON"
                             self.move_delay = max(80, self.move_delay - 3)
                     
                     self.move_timer = 0
+                    self.needs_redraw = True
                         
             self.particles.update()
+            if len(self.particles):
+                self.needs_redraw = True
+            if self.game_state == "PLAYING" and self.detailed:
+                radius = self.food_glow_radius()
+                if radius != self.glow_radius:
+                    self.glow_radius = radius
+                    self.needs_redraw = True
+            if self.idle_render and not self.needs_redraw:
+                continue
+            self.needs_redraw = False
             
-            self.screen.blit(self.background, (0, 0))
+            if self.game_state == "PLAYING":
+                self.update_camera()
+                self.draw_board()
+            else:
+                self.screen.blit(self.background, (0, 0))
             
             if self.game_state == "MENU":
                 self.draw_menu()
             elif self.game_state == "PLAYING":
-                game_area = pygame.Rect(0, 0, self.GRID_WIDTH * self.CELL_SIZE, self.GRID_HEIGHT * self.CELL_SIZE)
-                pygame.draw.rect(self.screen, (20, 20, 40), game_area)
-                
-                for x in range(self.GRID_WIDTH):
-                    for y in range(self.GRID_HEIGHT):
-                        rect = pygame.Rect(x * self.CELL_SIZE, y * self.CELL_SIZE, self.CELL_SIZE, self.CELL_SIZE)
-                        pygame.draw.rect(self.screen, Colors.GRID, rect, 1)
-                
                 self.draw_food()
                 self.draw_snake()
                 self.particles.draw(self.screen)
@@ -367,12 +535,55 @@ class ModernSnakeGame:
                 
             elif self.game_state == "GAME_OVER":
                 self.draw_game_over()
+            elif self.game_state == "WON":
+                self.draw_board_cleared()
                 
             pygame.display.flip()
             
         pygame.quit()
         sys.exit()
 
+def hamiltonian_cycle(width, height):
+    """Cells of a closed tour of an even-height board: rows snake right/left over
+    columns 1.., then column 0 leads back up to the start."""
+    cells = []
+    for y in range(height):
+        xs = range(1, width) if y % 2 == 0 else range(width - 1, 0, -1)
+        cells.extend((x, y) for x in xs)
+    cells.extend((0, y) for y in range(height - 1, -1, -1))
+    return cells
+
+def bench(width=64, height=64, ticks=20000):
+    """Time move() + check_self_collision() for snakes from length 3 to a full board."""
+    tour = hamiltonian_cycle(width, height)
+    size = len(tour)
+    snake = Snake(width, height)
+    for length in (3, 64, 512, size // 2, size - 1):
+        # the snake follows the tour, so it never hits a wall or itself
+        snake.reset(body=[tour[-i % size] for i in range(length)])
+        step = 0
+        start = time.perf_counter()
+        for _ in range(ticks):
+            (hx, hy), (nx, ny) = tour[step % size], tour[(step + 1) % size]
+            snake.next_direction = (nx - hx, ny - hy)
+            snake.move()
+            if snake.check_self_collision():
+                raise AssertionError("tour collided")
+            step += 1
+        us = (time.perf_counter() - start) / ticks * 1e6
+        print(f"length {length:5d} on {width}x{height}: {us:6.2f} us/tick")
+
+def _arg(name, default, cast=int):
+    if name in sys.argv:
+        return cast(sys.argv[sys.argv.index(name) + 1])
+    return default
+
 if __name__ == "__main__":
-    game = ModernSnakeGame()
+    # python snake.py [--grid WxH] [--cell PX] [--always-render] | --bench
+    if "--bench" in sys.argv:
+        bench()
+        sys.exit()
+    grid_width, grid_height = map(int, _arg("--grid", "32x24", str).lower().split("x"))
+    game = ModernSnakeGame(grid_width, grid_height, _arg("--cell", 25),
+                           idle_render="--always-render" not in sys.argv)
     game.run() 
\ No newline at end of file
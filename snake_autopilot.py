@@ -0,0 +1,169 @@
+# Snake autopilot — shortest-path planner with path reuse and a tail-following fallback
+# BFS runs over the flat grid with a time-aware rule: a body cell can be
+# entered once the tail will have left it. A plan to the food is kept and
+# followed move by move; it is only rebuilt when the food moves or the snake
+# left the planned route. Before committing to the food, the planner checks
+# that the tail is still reachable after eating; if not (or if the food is
+# unreachable) it chases its own tail instead.
+#
+# CLI: python snake_autopilot.py [--games N] [--seed S] [--width W] [--height H]
+#      plays N headless games and reports score and planner microseconds per tick.
+
+import sys, time
+from collections import deque
+
+DIRECTIONS = ((0, -1), (0, 1), (-1, 0), (1, 0))  # same order as snake_env.ACTIONS
+
+
+class Autopilot:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        # neighbours[cell] -> [(next_cell, direction), ...] inside the board
+        self.neighbours = []
+        for cell in range(width * height):
+            x, y = cell % width, cell // width
+            self.neighbours.append([((y + dy) * width + x + dx, (dx, dy))
+                                    for dx, dy in DIRECTIONS
+                                    if 0 <= x + dx < width and 0 <= y + dy < height])
+        self.path = deque()   # cells still to visit, next move first
+        self.target = None
+        self.ticks = 0
+        self.replans = 0
+        self.elapsed = 0.0
+
+    @property
+    def us_per_tick(self):
+        return self.elapsed / self.ticks * 1e6 if self.ticks else 0.0
+
+    def _cell(self, pos):
+        return pos[1] * self.width + pos[0]
+
+    def _vacate(self, body, pending):
+        """Moves until each cell is free: body segment j leaves after len - j moves."""
+        vacate = [0] * (self.width * self.height)
+        n = len(body) + pending
+        for j, pos in enumerate(body):
+            cell = self._cell(pos)
+            vacate[cell] = max(vacate[cell], n - j)
+        return vacate
+
+    def _bfs(self, start, goal, vacate):
+        """Cells from start (exclusive) to goal, or None if the goal can't be reached."""
+        parent = {start: None}
+        frontier, depth = [start], 0
+        while frontier:
+            depth += 1
+            nxt = []
+            for cell in frontier:
+                for n, _ in self.neighbours[cell]:
+                    if n in parent or vacate[n] > depth:
+                        continue
+                    parent[n] = cell
+                    if n == goal:
+                        path = deque()
+                        while n != start:
+                            path.appendleft(n)
+                            n = parent[n]
+                        return path
+                    nxt.append(n)
+            frontier = nxt
+        return None
+
+    def _safe_after(self, body, pending, path):
+        """After following path and eating, can the head still reach the tail?"""
+        grown = len(body) + min(pending, len(path))
+        after = [(c % self.width, c // self.width) for c in reversed(path)] + list(body)
+        after = after[:grown]
+        if len(after) < 2:
+            return True
+        vacate = self._vacate(after, 1)
+        return self._bfs(self._cell(after[0]), self._cell(after[-1]), vacate) is not None
+
+    def _plan(self, snake, food):
+        self.replans += 1
+        head = self._cell(snake.body[0])
+        vacate = self._vacate(snake.body, snake.grow_pending)
+        if food is not None:
+            path = self._bfs(head, self._cell(food), vacate)
+            if path and self._safe_after(snake.body, snake.grow_pending, path):
+                self.path, self.target = path, food
+                return
+        # no safe route to the food: take one step along the way to our tail
+        self.path, self.target = deque(), None
+        tail = self._bfs(head, self._cell(snake.body[-1]), vacate)
+        if tail and len(snake.body) > 1:
+            self.path.append(tail[0])
+            return
+        # boxed in: step toward the largest open area
+        best, best_area = None, -1
+        for n, _ in self.neighbours[head]:
+            if vacate[n] <= 1:
+                area = self._area(n, vacate)
+                if area > best_area:
+                    best, best_area = n, area
+        if best is not None:
+            self.path.append(best)
+
+    def _area(self, start, vacate):
+        seen, stack = {start}, [start]
+        while stack:
+            for n, _ in self.neighbours[stack.pop()]:
+                if n not in seen and vacate[n] <= 1:
+                    seen.add(n)
+                    stack.append(n)
+        return len(seen)
+
+    def choose(self, snake, food):
+        """Direction for the snake's next move toward food (an (x, y) cell or None)."""
+        start = time.perf_counter()
+        head = self._cell(snake.body[0])
+        # reuse the plan while we are on it and the food has not moved
+        if not (self.path and self.target is not None and self.target == food
+                and self.path[0] in (n for n, _ in self.neighbours[head])):
+            self._plan(snake, food)
+        direction = snake.direction
+        if self.path:
+            step = self.path.popleft()
+            for n, d in self.neighbours[head]:
+                if n == step:
+                    direction = d
+                    break
+        self.elapsed += time.perf_counter() - start
+        self.ticks += 1
+        return direction
+
+
+# ---------- Headless stress driver ----------
+def _arg(name, default, cast=int):
+    if name in sys.argv:
+        return cast(sys.argv[sys.argv.index(name) + 1])
+    return default
+
+
+def main():
+    from snake_env import SnakeEnv
+    games, seed = _arg("--games", 20), _arg("--seed", 0)
+    width, height = _arg("--width", 32), _arg("--height", 24)
+    env = SnakeEnv(width, height)
+    total_ticks = total_replans = wins = 0
+    scores, elapsed = [], 0.0
+    for g in range(games):
+        env.reset(seed + g)
+        pilot = Autopilot(width, height)
+        while not env.done:
+            direction = pilot.choose(env.snake, env.food.position)
+            env.step(DIRECTIONS.index(direction))
+        scores.append(env.score)
+        wins += env.won
+        total_ticks += pilot.ticks
+        total_replans += pilot.replans
+        elapsed += pilot.elapsed
+    print(f"{games} games on {width}x{height}: mean score {sum(scores) / games:.1f}, "
+          f"best {max(scores)}, cleared {wins}")
+    print(f"{total_ticks} ticks, {total_replans / total_ticks:.2f} replans/tick, "
+          f"{elapsed / total_ticks * 1e6:.1f} us/tick planning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+# Snake environment — headless, seedable snake simulation for bots and CI
+# SnakeEnv wraps the Snake/Food logic from snake.py behind reset(seed) and
+# step(action) -> (observation, reward, done), without ever initializing
+# pygame. VecSnakeEnv runs N independent games at once in NumPy arrays (a ring
+# buffer per body plus an occupancy grid per board) for evaluating policies
+# across thousands of seeds.
+#
+# CLI: python snake_env.py [--envs N] [--ticks T] [--seed S] [--width W] [--height H]
+#      runs a greedy food-seeking policy through both and prints ticks/second.
+
+import random, sys, time
+from snake import Snake, Food
+
+try:
+    import numpy as np
+except ImportError:  # SnakeEnv still works; VecSnakeEnv needs NumPy
+    np = None
+
+ACTIONS = ((0, -1), (0, 1), (-1, 0), (1, 0))  # up, down, left, right; opposite = a ^ 1
+KEEP = -1          # action that keeps the current direction
+REWARD_FOOD = 1.0
+REWARD_DEATH = -1.0
+
+
+class SnakeEnv:
+    """One game. Observation: (head_x, head_y, food_x, food_y, dir_x, dir_y, length);
+    food is (-1, -1) once the board is full."""
+
+    def __init__(self, width=32, height=24, hunger=None):
+        self.width = width
+        self.height = height
+        # steps without eating before the episode is cut, so looping bots end
+        self.hunger = hunger or 2 * width * height
+        self.reset()
+
+    def reset(self, seed=None):
+        self.rng = random.Random(seed)
+        self.snake = Snake(self.width, self.height)
+        self.food = Food(self.width, self.height, self.rng)
+        self.food.respawn(self.snake)
+        self.score = 0
+        self.steps = 0
+        self.starving = 0
+        self.done = False
+        self.won = False
+        return self.observation()
+
+    def observation(self):
+        hx, hy = self.snake.body[0]
+        fx, fy = self.food.position or (-1, -1)
+        dx, dy = self.snake.direction
+        return (hx, hy, fx, fy, dx, dy, len(self.snake.body))
+
+    def step(self, action=KEEP):
+        if self.done:
+            return self.observation(), 0.0, True
+        if action != KEEP:
+            self.snake.steer(ACTIONS[action])
+        self.steps += 1
+        self.starving += 1
+        reward = 0.0
+        if self.snake.move() == "WALL_COLLISION" or self.snake.check_self_collision():
+            self.done = True
+            reward = REWARD_DEATH
+        elif self.snake.get_head_position() == self.food.position:
+            self.score += 1
+            self.starving = 0
+            self.snake.grow()
+            reward = REWARD_FOOD
+            if self.food.respawn(self.snake) is None:
+                self.done = self.won = True
+        if self.starving >= self.hunger:
+            self.done = True
+        return self.observation(), reward, self.done
+
+
+class VecSnakeEnv:
+    """n games stepped together. step(actions) takes an int array of ACTIONS
+    indices (or KEEP) and returns (observations[n, 7], rewards[n], done[n]).
+    Finished games stay frozen until the next reset()."""
+
+    def __init__(self, n, width=32, height=24, hunger=None):
+        if np is None:
+            raise RuntimeError("VecSnakeEnv needs NumPy")
+        self.n = n
+        self.width = width
+        self.height = height
+        self.hunger = hunger or 2 * width * height
+        self.cap = width * height + 1   # ring size: a full board plus the new head
+        self.dx = np.array([a[0] for a in ACTIONS], dtype=np.int64)
+        self.dy = np.array([a[1] for a in ACTIONS], dtype=np.int64)
+        self.rows = np.arange(n)
+        self.reset()
+
+    def reset(self, seed=None):
+        n, w, h = self.n, self.width, self.height
+        self.rng = np.random.default_rng(seed)
+        self.body = np.zeros((n, self.cap), dtype=np.int64)   # ring buffer of cells
+        self.occupied = np.zeros((n, w * h), dtype=np.uint8)
+        # same start as Snake.reset(): three cells in the middle, heading right
+        sx, sy = w // 2, h // 2
+        start = [sy * w + sx - 2, sy * w + sx - 1, sy * w + sx]  # tail .. head
+        self.body[:, :3] = start
+        self.occupied[:, start] = 1
+        self.head = np.full(n, 2, dtype=np.int64)      # ring index of the head
+        self.length = np.full(n, 3, dtype=np.int64)
+        self.direction = np.full(n, 3, dtype=np.int64)  # right
+        self.pending = np.zeros(n, dtype=np.int64)      # growth owed to the next moves
+        self.score = np.zeros(n, dtype=np.int64)
+        self.starving = np.zeros(n, dtype=np.int64)
+        self.done = np.zeros(n, dtype=bool)
+        self.won = np.zeros(n, dtype=bool)
+        self.food = np.zeros(n, dtype=np.int64)
+        self._respawn(self.rows)
+        return self.observation()
+
+    def _respawn(self, rows):
+        """Uniform pick among each row's free cells; rows with none have won."""
+        free = self.occupied[rows] == 0
+        keys = self.rng.random(free.shape) * free
+        self.food[rows] = keys.argmax(axis=1)
+        full = ~free.any(axis=1)
+        if full.any():
+            self.food[rows[full]] = -1
+            self.won[rows[full]] = self.done[rows[full]] = True
+
+    def observation(self):
+        w = self.width
+        head = self.body[self.rows, self.head]
+        food_x = np.where(self.food >= 0, self.food % w, -1)
+        food_y = np.where(self.food >= 0, self.food // w, -1)
+        return np.stack([head % w, head // w, food_x, food_y,
+                         self.dx[self.direction], self.dy[self.direction], self.length], axis=1)
+
+    def step(self, actions):
+        w, h = self.width, self.height
+        actions = np.asarray(actions, dtype=np.int64)
+        rewards = np.zeros(self.n)
+        live = (~self.done).nonzero()[0]
+        if not len(live):
+            return self.observation(), rewards, self.done.copy()
+
+        # turn unless the action keeps going or would reverse onto the neck
+        act, cur = actions[live], self.direction[live]
+        turn = (act != KEEP) & (act != (cur ^ 1))
+        self.direction[live] = np.where(turn, act, cur)
+        d = self.direction[live]
+
+        head = self.body[live, self.head[live]]
+        nx, ny = head % w + self.dx[d], head // w + self.dy[d]
+        wall = (nx < 0) | (nx >= w) | (ny < 0) | (ny >= h)
+        self.starving[live] += 1
+        self._die(live[wall], rewards)
+        live, nx, ny = live[~wall], nx[~wall], ny[~wall]
+        new = ny * w + nx
+
+        # push the head, then release the tail unless growth is owed
+        self.head[live] = (self.head[live] + 1) % self.cap
+        self.body[live, self.head[live]] = new
+        self.occupied[live, new] += 1
+        grow = self.pending[live] > 0
+        self.pending[live[grow]] -= 1
+        self.length[live[grow]] += 1
+        keep = live[~grow]
+        tail = self.body[keep, (self.head[keep] - self.length[keep]) % self.cap]
+        self.occupied[keep, tail] -= 1
+
+        hit = self.occupied[live, new] > 1
+        self._die(live[hit], rewards)
+        live, new = live[~hit], new[~hit]
+
+        ate = live[new == self.food[live]]
+        if len(ate):
+            self.score[ate] += 1
+            self.pending[ate] += 1
+            self.starving[ate] = 0
+            rewards[ate] = REWARD_FOOD
+            self._respawn(ate)
+        self.done |= self.starving >= self.hunger
+        return self.observation(), rewards, self.done.copy()
+
+    def _die(self, rows, rewards):
+        self.done[rows] = True
+        rewards[rows] = REWARD_DEATH
+
+
+# ---------- Greedy baseline policy and benchmark ----------
+def greedy(obs):
+    """Head straight for the food: horizontal first, then vertical."""
+    hx, hy, fx, fy = obs[0], obs[1], obs[2], obs[3]
+    if fx > hx:
+        return 3
+    if fx < hx:
+        return 2
+    return 1 if fy > hy else 0
+
+
+def greedy_vec(obs):
+    hx, hy, fx, fy = obs[:, 0], obs[:, 1], obs[:, 2], obs[:, 3]
+    return np.where(fx > hx, 3, np.where(fx < hx, 2, np.where(fy > hy, 1, 0)))
+
+
+def _arg(name, default, cast=int):
+    if name in sys.argv:
+        return cast(sys.argv[sys.argv.index(name) + 1])
+    return default
+
+
+def main():
+    envs, ticks, seed = _arg("--envs", 4096), _arg("--ticks", 200), _arg("--seed", 0)
+    width, height = _arg("--width", 32), _arg("--height", 24)
+
+    env = SnakeEnv(width, height)
+    obs, steps, games, scores = env.reset(seed), 0, 1, 0
+    start = time.perf_counter()
+    while steps < envs * ticks // 16:
+        obs, _, done = env.step(greedy(obs))
+        steps += 1
+        if done:
+            scores += env.score
+            games += 1
+            obs = env.reset(seed + games)
+    elapsed = time.perf_counter() - start
+    print(f"SnakeEnv:    {steps / elapsed:12,.0f} ticks/s  ({games} games, mean score {scores / games:.1f})")
+
+    if np is None:
+        print("VecSnakeEnv: skipped, NumPy is not installed")
+        return
+    vec = VecSnakeEnv(envs, width, height)
+    obs = vec.reset(seed)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        obs, _, done = vec.step(greedy_vec(obs))
+    elapsed = time.perf_counter() - start
+    print(f"VecSnakeEnv: {envs * ticks / elapsed:12,.0f} ticks/s  ({envs} games x {ticks} ticks, "
+          f"mean score {vec.score.mean():.1f}, {int(done.sum())} finished)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# Sound bank — every synthesized SFX of a game in one precompiled file
+# The bank is built once from the game's tone definitions, then memory-mapped
+# on later launches so start-up costs a file read instead of synthesis.
+#
+# File layout (little endian):
+#   magic b"SFXB" | u32 format | 40-byte hex version hash | u32 entry count
+#   entries: u16 name length, name (utf-8), u64 offset, u64 length
+#   PCM data, each buffer aligned to 16 bytes
+
+import os, struct, hashlib, mmap
+import synth
+
+MAGIC = b"SFXB"
+FORMAT = 1
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "__sfxcache__")
+_HEADER = struct.Struct("<4sI40sI")
+_ENTRY = struct.Struct("<QQ")
+
+
+def params(spec):
+    """Fill a (freq, secs[, vol, shape, envelope, channels]) tuple with synth.pcm defaults."""
+    defaults = (None, None, 0.25, "sine", False, 2)
+    return tuple(spec) + defaults[len(spec):]
+
+
+def version_hash(tones):
+    """Hash of the synth version and every tone definition; any change means rebuild."""
+    h = hashlib.sha1(f"{FORMAT}:{synth.VERSION}:{synth.SAMPLE_RATE}".encode())
+    for name in sorted(tones):
+        h.update(f"|{name}={params(tones[name])!r}".encode())
+    return h.hexdigest().encode()
+
+
+def build(path, tones):
+    """Synthesize every tone and write the bank file atomically."""
+    names = sorted(tones)
+    index_size = _HEADER.size + sum(2 + len(n.encode()) + _ENTRY.size for n in names)
+    offset = (index_size + 15) & ~15
+    index, blobs = [], []
+    for name in names:
+        data = synth.pcm(*params(tones[name]))
+        pad = -len(data) & 15
+        index.append((name, offset, len(data)))
+        blobs.append(data + bytes(pad))
+        offset += len(data) + pad
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT, version_hash(tones), len(names)))
+        for name, off, n in index:
+            raw = name.encode()
+            f.write(struct.pack("<H", len(raw)) + raw + _ENTRY.pack(off, n))
+        f.write(bytes(-f.tell() & 15))
+        for blob in blobs:
+            f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())  # the data must be on disk before the rename is
+    os.replace(tmp, path)
+
+
+def _read_index(mm, tones):
+    magic, fmt, ver, count = _HEADER.unpack_from(mm, 0)
+    if magic != MAGIC or fmt != FORMAT or ver != version_hash(tones):
+        return None
+    pos, index = _HEADER.size, {}
+    for _ in range(count):
+        (n,) = struct.unpack_from("<H", mm, pos)
+        name = bytes(mm[pos + 2:pos + 2 + n]).decode()
+        pos += 2 + n
+        off, length = index[name] = _ENTRY.unpack_from(mm, pos)
+        if off + length > len(mm):  # truncated file behind a valid header
+            return None
+        pos += _ENTRY.size
+    return index
+
+
+def _open(path, tones):
+    try:
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None, None
+    try:
+        index = _read_index(mm, tones)
+    except struct.error:
+        index = None
+    if index is None or set(index) != set(tones):
+        mm.close()
+        return None, None
+    return mm, index
+
+
+def load(game, tones):
+    """Return {name: pygame.mixer.Sound} for a game's tone definitions.
+
+    tones maps a sound name to its synth.pcm arguments. The bank file is
+    rebuilt whenever the definitions or the synth version change. If the
+    cache directory is not writable, or the rebuilt bank still can't be
+    read, the sounds are synthesized in memory.
+    """
+    import pygame
+    path = os.path.join(CACHE_DIR, game + ".sfxbank")
+    mm, index = _open(path, tones)
+    if mm is None:
+        try:
+            build(path, tones)
+        except OSError:
+            return {name: synth.sound(*params(spec)) for name, spec in tones.items()}
+        mm, index = _open(path, tones)
+    if mm is None:  # no usable bank even after a rebuild: skip the cache
+        return {name: synth.sound(*params(spec)) for name, spec in tones.items()}
+    # pygame copies each slice into its own chunk once; the mmap pages are never
+    # duplicated into Python bytes on the way, so the file can be closed afterwards.
+    # Every view is released before the mmap closes, even if pygame raises.
+    with mm:
+        sounds = {}
+        with memoryview(mm) as view:
+            for name, (off, n) in index.items():
+                with view[off:off + n] as chunk:
+                    sounds[name] = pygame.mixer.Sound(buffer=chunk)
+    return sounds
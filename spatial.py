@@ -0,0 +1,103 @@
+# Uniform spatial hash — broadphase for circle collisions
+# Points are bucketed into square cells; a query only looks at the cells its
+# radius can reach, so N-vs-M tests cost about O(N + M) instead of O(N*M).
+#
+# Stress mode:  python spatial.py [--max N]
+
+import math, random, time
+
+
+class SpatialHash:
+    def __init__(self, cell):
+        self.cell = cell
+        self.buckets = {}
+
+    def clear(self):
+        self.buckets.clear()
+
+    def insert(self, i, x, y):
+        key = (int(x // self.cell), int(y // self.cell))
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            self.buckets[key] = [i]
+        else:
+            bucket.append(i)
+
+    def rebuild(self, items):
+        """Hash items by list index; call once per frame before querying."""
+        self.buckets.clear()
+        for i, it in enumerate(items):
+            self.insert(i, it.x, it.y)
+
+    def query(self, x, y, r):
+        """Indices (ascending, so list order is kept) of items maybe within r of (x, y)."""
+        c = self.cell
+        x0, x1 = int((x - r) // c), int((x + r) // c)
+        y0, y1 = int((y - r) // c), int((y + r) // c)
+        get = self.buckets.get
+        found = []
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = get((cx, cy))
+                if bucket:
+                    found.extend(bucket)
+        found.sort()
+        return found
+
+
+# ---------- Stress mode ----------
+class _Dot:
+    __slots__ = ("x", "y", "alive")
+
+    def __init__(self, rng, w, h):
+        self.x, self.y = rng.uniform(0, w), rng.uniform(0, h)
+        self.alive = True
+
+
+def _brute(zombies, bullets, reach):
+    hits = 0
+    for z in zombies:
+        for b in bullets:
+            if math.hypot(z.x - b.x, z.y - b.y) < reach:
+                hits += 1
+    return hits
+
+
+def _hashed(zombies, bullets, reach, grid):
+    hits = 0
+    grid.rebuild(bullets)
+    for z in zombies:
+        for i in grid.query(z.x, z.y, reach):
+            b = bullets[i]
+            if math.hypot(z.x - b.x, z.y - b.y) < reach:
+                hits += 1
+    return hits
+
+
+def stress(max_n=8000, seed=1):
+    """Time brute force vs the hash for growing zombie/bullet counts."""
+    rng = random.Random(seed)
+    reach = 16 + 4                      # zombie radius + bullet slack, as in chess.py
+    grid = SpatialHash(reach * 2)
+    # keep the density of a crowded 960x600 arena as the world grows
+    n = 250
+    print(f"{'entities':>9} {'brute ms':>10} {'hash ms':>9} {'ns/entity':>10}")
+    while n <= max_n:
+        side = math.sqrt(n / 200) * 600
+        zs = [_Dot(rng, side * 1.6, side) for _ in range(n // 2)]
+        bs = [_Dot(rng, side * 1.6, side) for _ in range(n // 2)]
+        t = time.perf_counter(); hb = _hashed(zs, bs, reach, grid); th = time.perf_counter() - t
+        if n <= 4000:
+            t = time.perf_counter(); bb = _brute(zs, bs, reach); tb = time.perf_counter() - t
+            assert bb == hb
+            brute = f"{tb * 1000:10.1f}"
+        else:
+            brute = f"{'-':>10}"
+        print(f"{n:9d} {brute} {th * 1000:9.2f} {th * 1e9 / n:10.0f}")
+        n *= 2
+
+
+if __name__ == "__main__":
+    import sys
+    top = int(sys.argv[sys.argv.index("--max") + 1]) if "--max" in sys.argv else 16000
+    stress(top)
@@ -0,0 +1,102 @@
+# Tiny Synth — shared tone generator for the games (no files, no loops per sample)
+# Builds whole PCM buffers at once with NumPy when it is installed, and with
+# slice/comprehension tricks on array.array when it is not.
+
+import math, array
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # pure-array fallback
+    np = None
+
+SAMPLE_RATE = 44100
+VERSION = 1  # bump when the generated samples change (invalidates sound banks)
+SHAPES = ("sine", "square", "tri", "saw")
+
+
+def _wave_numpy(freq, n, shape):
+    t = np.arange(n, dtype=np.float64)
+    if shape == "square":
+        # first half of every period is +1, second half -1
+        return np.where((t * freq * 2 // SAMPLE_RATE) % 2 == 0, 1.0, -1.0)
+    if shape == "tri":
+        return 2 / math.pi * np.arcsin(np.sin(2 * math.pi * freq * t / SAMPLE_RATE))
+    if shape == "saw":
+        return 2.0 * ((t * freq / SAMPLE_RATE) % 1) - 1.0
+    return np.sin(2 * math.pi * freq * t / SAMPLE_RATE)
+
+
+def _envelope_numpy(n):
+    attack = max(1, int(n * 0.01))
+    release = max(1, int(n * 0.08))
+    t = np.arange(n, dtype=np.float64)
+    env = np.ones(n)
+    env[:attack] = t[:attack] / attack
+    tail = t > n - release
+    env[tail] = np.maximum(0.0, (n - t[tail]) / release)
+    return env
+
+
+def _pcm_numpy(freq, n, vol, shape, envelope, channels):
+    s = _wave_numpy(freq, n, shape)
+    if envelope:
+        s = np.clip(s * _envelope_numpy(n), -1.0, 1.0)
+    mono = (s * vol * 32767).astype(np.int16)  # truncates toward zero like int()
+    if channels > 1:
+        mono = np.repeat(mono, channels)
+    return mono.tobytes()
+
+
+def _wave_array(freq, n, shape):
+    k = 2 * math.pi * freq / SAMPLE_RATE
+    sin = math.sin
+    if shape == "square":
+        half = freq * 2
+        return [1.0 if (t * half // SAMPLE_RATE) % 2 == 0 else -1.0 for t in range(n)]
+    if shape == "tri":
+        asin, c = math.asin, 2 / math.pi
+        return [c * asin(sin(k * t)) for t in range(n)]
+    if shape == "saw":
+        step = freq / SAMPLE_RATE
+        return [2.0 * ((t * step) % 1) - 1.0 for t in range(n)]
+    return [sin(k * t) for t in range(n)]
+
+
+def _pcm_array(freq, n, vol, shape, envelope, channels):
+    s = _wave_array(freq, n, shape)
+    if envelope:
+        attack = max(1, int(n * 0.01))
+        release = max(1, int(n * 0.08))
+        for t in range(attack):
+            s[t] *= t / attack
+        for t in range(max(attack, n - release + 1), n):
+            s[t] = max(-1.0, min(1.0, s[t] * max(0.0, (n - t) / release)))
+    amp = vol * 32767
+    mono = array.array("h", [int(v * amp) for v in s])
+    if channels == 1:
+        return mono.tobytes()
+    buf = array.array("h", bytes(2 * n * channels))
+    for c in range(channels):
+        buf[c::channels] = mono
+    return buf.tobytes()
+
+
+@lru_cache(maxsize=None)
+def pcm(freq, secs, vol=0.25, shape="sine", envelope=False, channels=2):
+    """Return signed 16-bit PCM bytes for one tone, memoized by its parameters.
+
+    envelope adds the short attack/release ramp used by the zombie shooter to
+    avoid clicks; channels duplicates the mono signal (2 = interleaved stereo).
+    """
+    if shape not in SHAPES:
+        shape = "sine"
+    n = int(SAMPLE_RATE * secs)
+    build = _pcm_numpy if np is not None else _pcm_array
+    return build(freq, n, vol, shape, envelope, channels)
+
+
+def sound(freq, secs, vol=0.25, shape="sine", envelope=False, channels=2):
+    """pygame.mixer.Sound for a tone (the mixer must already be initialised)."""
+    import pygame
+    return pygame.mixer.Sound(buffer=pcm(freq, secs, vol, shape, envelope, channels))
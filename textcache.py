@@ -0,0 +1,54 @@
+# Text cache — memoized fonts and rendered text surfaces for HUDs and menus
+# Fonts are loaded once per (name, size, bold, italic). Rendered surfaces are
+# kept in an LRU keyed by (text, font, color, antialias) under a byte budget,
+# so a score or counter is only re-rendered when its value actually changes.
+
+from collections import OrderedDict
+import pygame
+
+BUDGET = 4 * 1024 * 1024  # bytes of cached text surfaces
+
+_fonts = {}
+
+
+def font(name, size, bold=False, italic=False):
+    """pygame.font.SysFont, loaded once per (name, size, bold, italic)."""
+    key = (name, size, bold, italic)
+    f = _fonts.get(key)
+    if f is None:
+        f = _fonts[key] = pygame.font.SysFont(name, size, bold, italic)
+    return f
+
+
+class TextCache:
+    def __init__(self, budget=BUDGET):
+        self.budget = budget
+        self.used = 0
+        self.entries = OrderedDict()  # key -> (surface, nbytes)
+
+    def render(self, fnt, text, color, antialias=True):
+        key = (text, fnt, tuple(color), antialias)
+        hit = self.entries.get(key)
+        if hit is not None:
+            self.entries.move_to_end(key)
+            return hit[0]
+        surf = fnt.render(text, antialias, color)
+        size = surf.get_pitch() * surf.get_height()
+        self.entries[key] = (surf, size)
+        self.used += size
+        while self.used > self.budget and len(self.entries) > 1:
+            _, (_, old) = self.entries.popitem(last=False)
+            self.used -= old
+        return surf
+
+    def clear(self):
+        self.entries.clear()
+        self.used = 0
+
+
+_cache = TextCache()
+
+
+def render(fnt, text, color, antialias=True):
+    """fnt.render(text, antialias, color), served from the shared LRU when possible."""
+    return _cache.render(fnt, text, color, antialias)